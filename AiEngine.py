@@ -1,170 +1,1068 @@
 import pandas as pd
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import scipy.sparse as sp
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, TfidfVectorizer
+from sklearn.preprocessing import normalize
+from collections import defaultdict
+from functools import lru_cache
+import hashlib
+import os
 import re
+import threading
+import time
 from nltk.stem import WordNetLemmatizer
-from nltk.corpus import stopwords
+from nltk.corpus import stopwords, wordnet
 import nltk
-import mysql.connector
-from flask import jsonify
-
-# Download NLTK resources if not already available
-try:
-    nltk.data.find('corpora/wordnet')
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('wordnet')
-    nltk.download('stopwords')
-
-# Database configuration
-db_config = {
-    'host': 'localhost',
-    'user': 'root',
-    'password': '',  
-    'database': 'project_supervisor_rec'
+from db import get_connection
+from data_sources import STREAM_BATCH_SIZE, MySQLSource
+from index_store import ContentHasher, load_snapshot, save_snapshot
+from suggest import PrefixIndex, build_prefix_index
+
+# NLTK corpora are resolved from a local directory; downloading is opt-in
+NLTK_DATA_DIR = os.environ.get('FYP_NLTK_DATA')
+NLTK_AUTO_DOWNLOAD = os.environ.get('FYP_NLTK_DOWNLOAD', '0') == '1'
+NLTK_RESOURCES = {
+    'wordnet': 'corpora/wordnet',
+    'stopwords': 'corpora/stopwords'
+}
+
+# Index refresh tuning
+REFRESH_DELAY = float(os.environ.get('FYP_INDEX_REFRESH_DELAY', 2.0))  # seconds to batch admin edits
+MAX_INCREMENTAL_PATCHES = int(os.environ.get('FYP_INDEX_MAX_PATCHES', 20))  # patches before a full refit
+
+# Number of key terms shown with each supervisor
+KEY_TERMS_TOP_N = int(os.environ.get('FYP_KEY_TERMS_TOP_N', 5))
+
+# Size of the precomputed supervisor-to-supervisor neighbour table
+SIMILAR_TOP_K = int(os.environ.get('FYP_SIMILAR_TOP_K', 10))
+# Most similarities held at once while it is computed, and the number of most frequent terms
+# whose share of the product is done with dense arrays
+NEIGHBOUR_BLOCK_ENTRIES = int(os.environ.get('FYP_NEIGHBOUR_BLOCK_ENTRIES', 2 ** 24))
+NEIGHBOUR_DENSE_TERMS = int(os.environ.get('FYP_NEIGHBOUR_DENSE_TERMS', 1000))
+
+# Scoring backend: 'tfidf' is the exact sparse cosine, 'lsa' a dense cosine in a truncated-SVD space
+SCORERS = ('tfidf', 'lsa')
+SCORER = os.environ.get('FYP_SCORER', 'tfidf')
+if SCORER not in SCORERS:
+    raise ValueError(f"FYP_SCORER must be one of {', '.join(SCORERS)}, not '{SCORER}'")
+    
+# Latent dimensions of the LSA scorer
+LSA_COMPONENTS = int(os.environ.get('FYP_LSA_COMPONENTS', 128))
+
+# Upper bound on memoized token -> lemma entries
+LEMMA_CACHE_SIZE = int(os.environ.get('FYP_LEMMA_CACHE_SIZE', 50000))
+
+# Searchable fields: the table each is read from and its text columns. Every table has a SupervisorID
+FIELD_SOURCES = {
+    'expertise': ('expertise', ('Expertise',)),
+    'papers': ('papers', ('PaperTitle', 'PaperKeywords', 'PaperAbstract')),
+    'fyp': ('past_fyp', ('Title', 'Abstract'))
 }
 
+def parse_field_weights(spec):
+    """'expertise=1,papers=0.5' -> {'expertise': 1.0, 'papers': 0.5}; fields weighted 0 are not indexed"""
+    weights = {}
+    for item in spec.split(','):
+        if not item.strip():
+            continue
+        field, _, weight = item.partition('=')
+        field = field.strip()
+        if field not in FIELD_SOURCES:
+            raise ValueError(f"Unknown index field '{field}' in FYP_FIELD_WEIGHTS")
+        if float(weight) > 0:
+            weights[field] = float(weight)
+    if not weights:
+        raise ValueError("FYP_FIELD_WEIGHTS must give at least one field a positive weight")
+    # Column blocks always follow FIELD_SOURCES order
+    return {field: weights[field] for field in FIELD_SOURCES if field in weights}
+
+# Weight of each field in the combined score
+FIELD_WEIGHTS = parse_field_weights(os.environ.get('FYP_FIELD_WEIGHTS', 'expertise=1.0,papers=0.5,fyp=0.3'))
+
+# On-disk index snapshot used for fast cold starts and when the database is unreachable
+INDEX_SNAPSHOT_PATH = os.environ.get(
+    'FYP_INDEX_SNAPSHOT',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'index_snapshot')
+)
+
+def ensure_nltk_resources():
+    """Make sure the NLTK corpora are available locally before the recommender is built"""
+    if NLTK_DATA_DIR and NLTK_DATA_DIR not in nltk.data.path:
+        nltk.data.path.insert(0, NLTK_DATA_DIR)
+        
+    for name, resource in NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            if not NLTK_AUTO_DOWNLOAD:
+                raise LookupError(f"NLTK resource '{name}' not found in {nltk.data.path}; "
+                                  f"install it under FYP_NLTK_DATA or set FYP_NLTK_DOWNLOAD=1")
+            nltk.download(name, download_dir=NLTK_DATA_DIR, quiet=True)
+            
+    # Load WordNet eagerly; its lazy loader is not safe to trigger from several threads at once
+    wordnet.ensure_loaded()
+
+_WORD_RE = re.compile(r'\w+')
+_DIGITS_RE = re.compile(r'\d+')
+
+class TextAnalyzer:
+    """Single-pass tokenizer, stopword filter and lemmatizer shared by indexing and queries"""
+    def __init__(self, lemmatizer, stop_words, cache_size=LEMMA_CACHE_SIZE):
+        self.lemmatizer = lemmatizer
+        self.stop_words = frozenset(stop_words)
+        self.cache_size = cache_size
+        # Bounded memo: a token always maps to the same lemma (or to None when it is dropped)
+        self._lemma = lru_cache(maxsize=cache_size)(self._lemmatize_token)
+        
+    def __getstate__(self):
+        # Sent to worker processes without the memo, which every process grows on its own
+        state = dict(self.__dict__)
+        del state['_lemma']
+        return state
+        
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lemma = lru_cache(maxsize=self.cache_size)(self._lemmatize_token)
+        
+    def _lemmatize_token(self, token):
+        if token in self.stop_words:
+            return None
+            
+        lemma = self.lemmatizer.lemmatize(token)
+        # Single characters and sklearn's English stop words never made it into the vocabulary
+        if len(lemma) < 2 or lemma in ENGLISH_STOP_WORDS:
+            return None
+        return lemma
+        
+    def terms(self, text):
+        """Lowercased, stopword-free lemmas of a text"""
+        if not isinstance(text, str):
+            return []
+            
+        terms = []
+        lemma = self._lemma
+        for token in _WORD_RE.findall(text.lower()):
+            if not token.isalpha():
+                # Digits are dropped from inside a word, e.g. "web2" -> "web"
+                token = _DIGITS_RE.sub('', token)
+                if not token:
+                    continue
+                    
+            term = lemma(token)
+            if term is not None:
+                terms.append(term)
+        return terms
+        
+    def __call__(self, doc):
+        """TfidfVectorizer analyzer: unigrams and bigrams of a text or of already extracted terms"""
+        terms = doc if isinstance(doc, list) else self.terms(doc)
+        return terms + [f"{first} {second}" for first, second in zip(terms, terms[1:])]
+
+class MultiFieldVectorizer:
+    """One TF-IDF vectorizer per field, their vectors stacked side by side in one column block per field
+
+    Document rows are scaled by the field weights, query rows are not, so a single sparse product
+    gives sum(weight * cosine) over the fields.
+    """
+    def __init__(self, make_vectorizer, weights):
+        self.weights = dict(weights)
+        self.fields = list(self.weights)
+        self.vectorizers = {field: make_vectorizer() for field in self.fields}
+        self.feature_names = {field: np.array([], dtype=object) for field in self.fields}
+        self.slices = {}
+        self._update_slices()
+        
+    def fit_transform(self, field_docs):
+        """Fit every field on its aligned documents (lists of terms) and return the weighted matrix"""
+        for field in self.fields:
+            try:
+                self.vectorizers[field].fit(field_docs[field])
+                self.feature_names[field] = self.vectorizers[field].get_feature_names_out()
+            except ValueError:
+                # No terms in this field at all, e.g. an empty table
+                self.feature_names[field] = np.array([], dtype=object)
+        self._update_slices()
+        return self.transform_documents(field_docs)
+        
+    def set_fitted(self, field, vocabulary, idf):
+        """Restore a field's fitted state (from a snapshot) without refitting"""
+        vectorizer = self.vectorizers[field]
+        vectorizer.vocabulary_ = {term: i for i, term in enumerate(vocabulary)}
+        vectorizer.idf_ = idf
+        self.feature_names[field] = np.asarray(vocabulary, dtype=object)
+        self._update_slices()
+        
+    def transform_documents(self, field_docs):
+        """Weighted supervisor rows from each field's aligned documents"""
+        return sp.hstack([
+            self.weights[field] * self._transform_field(field, field_docs[field]) for field in self.fields
+        ], format='csr')
+        
+    def transform(self, term_lists):
+        """Unweighted query rows: the same terms looked up in every field's vocabulary"""
+        return sp.hstack([self._transform_field(field, term_lists) for field in self.fields], format='csr')
+        
+    def query_weights(self, query_matrix):
+        """Total weight of the fields each query has known terms in; scores divided by it stay in [0, 1]"""
+        active = np.zeros(query_matrix.shape[0])
+        for field in self.fields:
+            block = query_matrix[:, self.slices[field]]
+            active += self.weights[field] * (block.getnnz(axis=1) > 0)
+        return active
+        
+    def has_unknown_terms(self, field_docs):
+        """Whether any document has a word missing from its field's fitted vocabulary
+
+        transform() silently drops such terms. Only single words are checked: an edit nearly always
+        forms some bigram the corpus has never seen, and a missing bigram only loses one feature.
+        Words the fit discarded as too frequent count as missing too, which only costs a refit.
+        """
+        for field in self.fields:
+            vectorizer = self.vectorizers[field]
+            vocabulary = getattr(vectorizer, 'vocabulary_', {})
+            analyzer = vectorizer.analyzer
+            for doc in field_docs[field]:
+                terms = doc if isinstance(doc, list) else analyzer.terms(doc)
+                if any(term not in vocabulary for term in terms):
+                    return True
+        return False
+        
+    def field_block(self, matrix, field):
+        """The unweighted columns of one field"""
+        return matrix[:, self.slices[field]] / self.weights[field]
+        
+    def _transform_field(self, field, docs):
+        if len(self.feature_names[field]) == 0:
+            return sp.csr_matrix((len(docs), 0))
+        return self.vectorizers[field].transform(docs)
+        
+    def _update_slices(self):
+        start = 0
+        for field in self.fields:
+            end = start + len(self.feature_names[field])
+            self.slices[field] = slice(start, end)
+            start = end
+
+class LsaScorer:
+    """Cosine similarity in a dense float32 latent space fitted by truncated SVD
+
+    Scoring is one dense (queries x k) by (k x supervisors) product whatever the vocabulary size.
+    Scores are latent-space cosines, so min_score thresholds do not carry over from TF-IDF exactly.
+    """
+    def __init__(self, components, tfidf_matrix):
+        # (k x terms) basis; supervisor rows are projected onto it once
+        self.components = np.asarray(components, dtype=np.float32)
+        self.embeddings = self.project(tfidf_matrix)
+        
+    @classmethod
+    def fit(cls, tfidf_matrix, n_components=LSA_COMPONENTS):
+        """Fit the basis on the weighted TF-IDF matrix, or None when it is too small to reduce"""
+        n_components = min(n_components, tfidf_matrix.shape[0], tfidf_matrix.shape[1] - 1)
+        if n_components < 1:
+            return None
+        svd = TruncatedSVD(n_components=n_components, algorithm='randomized', random_state=0)
+        svd.fit(tfidf_matrix)
+        return cls(svd.components_, tfidf_matrix)
+        
+    def project(self, matrix):
+        """L2-normalised latent vectors of sparse rows (rows without known terms stay zero)"""
+        latent = np.asarray(sp.csr_matrix(matrix, dtype=np.float32) @ self.components.T)
+        return normalize(latent)
+        
+    def score(self, query_matrix):
+        """Dense (queries x supervisors) cosine similarities"""
+        return self.project(query_matrix) @ self.embeddings.T
+
+class SupervisorIndex:
+    """Immutable snapshot of the fitted vectorizer, TF-IDF matrix and supervisor rows"""
+    def __init__(self, vectorizer, tfidf_matrix, supervisor_data, patch_count=0, content_hash=None,
+                 neighbours=None, neighbour_scores=None, scorer='tfidf', lsa_components=None, patched_from=None,
+                 identity=None):
+        self.vectorizer = vectorizer
+        self.tfidf_matrix = tfidf_matrix
+        self.supervisor_data = supervisor_data
+        # Number of incremental patches applied since the vectorizer was last fitted
+        self.patch_count = patch_count
+        # Hash of the source rows of a full build; None once patched
+        self.content_hash = content_hash
+        # Assigned when the index is published; only meaningful within this process
+        self.version = 0
+        # Names the same index in every worker (shared cache keys): see SupervisorRecommender._identity
+        self.identity = identity
+        
+        # Plain column lists so queries can build results without going through pandas
+        self.supervisor_ids = supervisor_data['SupervisorID'].tolist()
+        self.names = supervisor_data['SvName'].tolist()
+        self.emails = supervisor_data['SvEmail'].tolist()
+        self.expertise = supervisor_data['Expertise'].tolist()
+        self.key_terms = supervisor_data['key_terms'].tolist()
+        self.row_of = {supervisor_id: row for row, supervisor_id in enumerate(self.supervisor_ids)}
+        
+        # Most similar other supervisors of every row (cosine over all weighted fields); filled in by
+        # build_neighbours once the index is published, patched from the previous index's table
+        self._neighbour_table = (neighbours, neighbour_scores) if neighbours is not None else None
+        # (previous index, its rows kept in this one) of a patched index, until the table is built
+        self._patched_from = patched_from
+        self._row_norms = None
+        self._prefix_index = None
+        
+        # Optional latent-space scorer; patches and snapshots reuse the fitted basis
+        self.lsa = None
+        if scorer == 'lsa' and tfidf_matrix is not None and tfidf_matrix.shape[0] > 0:
+            if lsa_components is not None and lsa_components.shape[1] == tfidf_matrix.shape[1]:
+                self.lsa = LsaScorer(lsa_components, tfidf_matrix)
+            else:
+                self.lsa = LsaScorer.fit(tfidf_matrix)
+        
+    @property
+    def prefix_index(self):
+        """Autocomplete over the first field's vocabulary and the expertise phrases, built once per index"""
+        if self._prefix_index is None:
+            if self.tfidf_matrix is None:
+                self._prefix_index = PrefixIndex({})
+            else:
+                field = self.vectorizer.fields[0]
+                block = sp.csr_matrix(self.tfidf_matrix[:, self.vectorizer.slices[field]])
+                # Document frequency: supervisors with a non-zero weight for the term
+                frequencies = np.bincount(block.indices, minlength=block.shape[1])
+                self._prefix_index = build_prefix_index(
+                    self.vectorizer.feature_names[field], frequencies,
+                    self.supervisor_data['expertise_phrases'].tolist()
+                )
+        return self._prefix_index
+        
+    @property
+    def neighbours(self):
+        table = self._neighbour_table
+        return table[0] if table is not None else None
+        
+    @property
+    def neighbour_scores(self):
+        table = self._neighbour_table
+        return table[1] if table is not None else None
+        
+    def build_neighbours(self):
+        """Fill in the neighbour table, from the previous index's table when this one is a patch of it"""
+        if self._neighbour_table is not None or self.tfidf_matrix is None:
+            return
+            
+        unit_matrix = normalize(self.tfidf_matrix).astype(np.float32)
+        previous, kept_rows = self._patched_from or (None, None)
+        if previous is not None and previous.neighbours is not None and previous.neighbours.shape[1] == SIMILAR_TOP_K:
+            table = patch_neighbours(previous.neighbours, previous.neighbour_scores, kept_rows, unit_matrix,
+                                     SIMILAR_TOP_K)
+        else:
+            table = nearest_neighbours(unit_matrix, SIMILAR_TOP_K)
+        self._neighbour_table = table
+        # Let the previous index go
+        self._patched_from = None
+        
+    def _neighbours_of(self, row):
+        # Scored against every row until the table of a freshly published index is ready
+        if self._row_norms is None:
+            self._row_norms = np.sqrt(np.asarray(self.tfidf_matrix.multiply(self.tfidf_matrix).sum(axis=1)).ravel())
+        norms = self._row_norms
+        products = self.tfidf_matrix.dot(self.tfidf_matrix[row].T).toarray().ravel()
+        scores = np.divide(products, norms * norms[row], out=np.zeros_like(products), where=norms * norms[row] > 0)
+        scores[row] = 0
+        best = top_k(scores, 0.0, SIMILAR_TOP_K)
+        return best, scores[best]
+        
+    def score(self, query_vector):
+        """Weighted multi-field cosine similarity of a query vector against every supervisor"""
+        if self.lsa is not None:
+            scores = self.lsa.score(query_vector)[0]
+        else:
+            # Field blocks are L2-normalised by their vectorizers, so a sparse dot product sums the
+            # weighted per-field cosines; dividing by the weight of the fields the query hits averages them
+            scores = self.tfidf_matrix.dot(query_vector.T).toarray().ravel()
+            active = self.vectorizer.query_weights(query_vector)[0]
+            if active > 0:
+                scores /= active
+        # Rounding can leave a perfect match a hair above 1
+        np.minimum(scores, 1.0, out=scores)
+        return scores
+        
+    def score_batch(self, query_matrix):
+        """Sparse (queries x supervisors) multi-field similarities from a single matrix product"""
+        if self.lsa is not None:
+            similarities = sp.csr_matrix(self.lsa.score(query_matrix))
+        else:
+            similarities = query_matrix.dot(self.tfidf_matrix.T).tocsr()
+            active = self.vectorizer.query_weights(query_matrix)
+            scale = np.divide(1.0, active, out=np.zeros_like(active), where=active > 0)
+            similarities = sp.diags(scale).dot(similarities).tocsr()
+        np.minimum(similarities.data, 1.0, out=similarities.data)
+        similarities.sort_indices()
+        return similarities
+        
+    def similar(self, supervisor_id, min_score=0.0, top_n=5):
+        """Look up the precomputed nearest neighbours of a supervisor"""
+        row = self.row_of.get(supervisor_id)
+        if row is None:
+            return []
+            
+        table = self._neighbour_table
+        neighbours, scores = (table[0][row], table[1][row]) if table is not None else self._neighbours_of(row)
+        
+        results = []
+        for neighbour, similarity in zip(neighbours, scores):
+            # Rows are sorted best first and padded with -1
+            if neighbour < 0 or similarity <= min_score:
+                break
+            results.append(self.result(neighbour, similarity))
+            if top_n is not None and 0 < top_n <= len(results):
+                break
+        return results
+        
+    def result(self, row, similarity):
+        """Build the JSON-ready result for one matrix row"""
+        return {
+            'supervisor_id': self.supervisor_ids[row],
+            'supervisor_name': self.names[row],
+            'supervisor_email': self.emails[row],
+            'expertise': self.expertise[row],
+            'similarity': float(similarity),
+            'key_terms': self.key_terms[row]
+        }
+        
+def analyze_rows(analyzer, rows, columns):
+    """Terms of each row: the analyzed texts of its columns, one after the other"""
+    return [[term for column in columns for term in analyzer.terms(row[column])] for row in rows]
+
+def chunked(rows, size):
+    """Lists of up to size rows from an iterator"""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def top_k(scores, min_score=0.0, top_n=None):
+    """Rows whose score exceeds min_score, best first and at most top_n of them"""
+    candidates = np.flatnonzero(scores > min_score)
+    
+    # Partial selection so only the winners are ever sorted
+    if top_n is not None and 0 < top_n < candidates.size:
+        winners = np.argpartition(-scores[candidates], top_n - 1)[:top_n]
+        candidates = np.sort(candidates[winners])
+        
+    # Stable sort keeps ties in row order
+    return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+def similarity_blocks(unit_matrix, rows):
+    """(rows, dense cosine similarities against every row) for consecutive blocks of the given rows
+
+    Blocks hold at most NEIGHBOUR_BLOCK_ENTRIES similarities. Nearly all the work of the sparse self
+    product goes into the few most frequent terms, so for large row sets those columns are multiplied
+    as dense arrays and only the long tail of rare terms stays sparse.
+    """
+    n_docs, n_terms = unit_matrix.shape
+    block_size = max(1, NEIGHBOUR_BLOCK_ENTRIES // max(n_docs, 1))
+    dense = None
+    if len(rows) > block_size and n_terms > 0:
+        frequencies = np.bincount(unit_matrix.indices, minlength=n_terms)
+        frequent = np.zeros(n_terms, dtype=bool)
+        frequent[np.argsort(-frequencies, kind='stable')[:NEIGHBOUR_DENSE_TERMS]] = True
+        columns = unit_matrix.tocsc()
+        dense = columns[:, np.flatnonzero(frequent)].toarray()
+        unit_matrix = columns[:, np.flatnonzero(~frequent)].tocsr()
+        
+    transposed = unit_matrix.T.tocsr()
+    for start in range(0, len(rows), block_size):
+        block_rows = rows[start:start + block_size]
+        similarities = unit_matrix[block_rows].dot(transposed).toarray()
+        if dense is not None:
+            similarities += dense[block_rows] @ dense.T
+        yield block_rows, similarities
+
+def best_k(candidates, scores, k):
+    """The k best (candidate, score) pairs of every row, best first and ties in candidate order
+
+    Rows with fewer positive scores are padded with -1 and 0.
+    """
+    if scores.shape[1] > k:
+        chosen = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        candidates = np.take_along_axis(candidates, chosen, axis=1)
+        scores = np.take_along_axis(scores, chosen, axis=1)
+    order = np.lexsort((candidates, -scores), axis=1)
+    candidates = np.take_along_axis(candidates, order, axis=1)
+    scores = np.take_along_axis(scores, order, axis=1)
+    
+    neighbours = np.full((scores.shape[0], k), -1, dtype=np.int32)
+    neighbour_scores = np.zeros((scores.shape[0], k), dtype=np.float32)
+    width = min(k, scores.shape[1])
+    positive = scores[:, :width] > 0
+    neighbours[:, :width] = np.where(positive, candidates[:, :width], -1)
+    neighbour_scores[:, :width] = np.where(positive, scores[:, :width], 0)
+    return neighbours, neighbour_scores
+
+def nearest_neighbours(unit_matrix, k, rows=None):
+    """Top-k most similar other rows of every row (or of the given rows) of an L2-normalised matrix"""
+    rows = np.arange(unit_matrix.shape[0]) if rows is None else np.asarray(rows)
+    neighbours = np.full((len(rows), k), -1, dtype=np.int32)
+    neighbour_scores = np.zeros((len(rows), k), dtype=np.float32)
+    if k <= 0:
+        return neighbours, neighbour_scores
+        
+    done = 0
+    for block_rows, similarities in similarity_blocks(unit_matrix, rows):
+        # A supervisor is not its own neighbour
+        similarities[np.arange(len(block_rows)), block_rows] = 0
+        candidates = np.broadcast_to(np.arange(similarities.shape[1]), similarities.shape)
+        block = slice(done, done + len(block_rows))
+        neighbours[block], neighbour_scores[block] = best_k(candidates, similarities, k)
+        done += len(block_rows)
+        
+    return neighbours, neighbour_scores
+
+def patch_neighbours(neighbours, neighbour_scores, kept_rows, unit_matrix, k):
+    """Neighbour table of a patched matrix from the table of the matrix it was patched from
+
+    kept_rows are the old rows still present, in their new order; the rows after them are the
+    changed supervisors. Only those are scored against every row. The other rows merge their
+    similarity to the changed rows into their lists, and a row is recomputed only when it lost a
+    neighbour to the patch and the merge cannot tell what replaces it.
+    """
+    n_docs, n_kept = unit_matrix.shape[0], len(kept_rows)
+    changed = np.arange(n_kept, n_docs)
+    if k <= 0 or len(changed) > max(1, NEIGHBOUR_BLOCK_ENTRIES // max(n_docs, 1)):
+        return nearest_neighbours(unit_matrix, k)
+        
+    # Old row numbers -> new ones; changed and deleted supervisors map to -1
+    new_row = np.full(neighbours.shape[0] + 1, -1, dtype=np.int32)
+    new_row[kept_rows] = np.arange(n_kept)
+    old_neighbours, old_scores = neighbours[kept_rows], neighbour_scores[kept_rows]
+    remapped = new_row[old_neighbours]
+    remapped_scores = np.where(remapped >= 0, old_scores, 0)
+    
+    # Similarity of every row to each changed row
+    to_changed = unit_matrix.dot(unit_matrix[changed].T).toarray()
+    
+    table = np.empty((n_docs, k), dtype=np.int32), np.empty((n_docs, k), dtype=np.float32)
+    candidates = np.hstack([remapped, np.broadcast_to(changed, (n_kept, len(changed)))])
+    table[0][:n_kept], table[1][:n_kept] = best_k(candidates, np.hstack([remapped_scores, to_changed[:n_kept]]), k)
+    table[0][n_kept:], table[1][n_kept:] = nearest_neighbours(unit_matrix, k, changed)
+    
+    # Kept rows the old table does not list score at most its k-th score, so a full list that lost
+    # an entry is exact only if the merged k-th score still reaches that
+    lost = ((old_neighbours >= 0) & (remapped < 0)).any(axis=1) & (old_neighbours[:, -1] >= 0)
+    unsure = np.flatnonzero(lost & (table[1][:n_kept, -1] < old_scores[:, -1]))
+    if unsure.size:
+        table[0][unsure], table[1][unsure] = nearest_neighbours(unit_matrix, k, unsure)
+    return table
+
+class IndexRefresher:
+    """Background worker that applies queued supervisor changes to the recommender"""
+    def __init__(self, recommender, delay=REFRESH_DELAY):
+        self.recommender = recommender
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pending_ids = set()
+        self._full_rebuild = False
+        self._thread = None
+        
+    def request(self, supervisor_ids=None):
+        """Queue a refresh; None means the whole index must be rebuilt"""
+        with self._lock:
+            if supervisor_ids is None:
+                self._full_rebuild = True
+            else:
+                self._pending_ids.update(int(sid) for sid in supervisor_ids)
+            
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='index-refresher', daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+        
+    def _take_pending(self):
+        with self._lock:
+            full_rebuild, pending_ids = self._full_rebuild, self._pending_ids
+            self._full_rebuild, self._pending_ids = False, set()
+        return full_rebuild, pending_ids
+        
+    def _requeue(self, full_rebuild, pending_ids):
+        with self._lock:
+            self._full_rebuild = self._full_rebuild or full_rebuild
+            self._pending_ids.update(pending_ids)
+        
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            # Let a burst of admin edits settle so they land in a single refresh
+            time.sleep(self.delay)
+            self._wakeup.clear()
+            
+            full_rebuild, pending_ids = self._take_pending()
+            if not full_rebuild and not pending_ids:
+                continue
+                
+            try:
+                self.recommender.refresh(None if full_rebuild else pending_ids)
+            except Exception as e:
+                # Keep serving the current index and retry with the next signal
+                print(f"Index refresh error: {e}")
+                self._requeue(full_rebuild, pending_ids)
+
 class SupervisorRecommender:
-    def __init__(self):
-        """Initialize the recommender system with database connection"""
+    def __init__(self, snapshot_path=INDEX_SNAPSHOT_PATH, key_terms_top_n=KEY_TERMS_TOP_N, field_weights=None,
+                 source=None, autoload=True, scorer=SCORER):
+        """Initialize the recommender system with database connection (or another row source)"""
+        ensure_nltk_resources()
         self.lemmatizer = WordNetLemmatizer()
         self.stopwords = set(stopwords.words('english'))
+        self.analyzer = TextAnalyzer(self.lemmatizer, self.stopwords)
+        self.snapshot_path = snapshot_path
+        self.key_terms_top_n = key_terms_top_n
+        self.field_weights = dict(field_weights or FIELD_WEIGHTS)
+        self.scorer = scorer
+        self.source = source if source is not None else MySQLSource(self.get_db_connection)
+        
+        # The live index is replaced as a whole so searches never see a half-built one
+        self._index = SupervisorIndex(self._make_field_vectorizer(), None, self._empty_supervisor_data())
+        self._version = 0
+        self._publish_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refresher = IndexRefresher(self)
+        
+        # The offline builder drives the build itself
+        if not autoload:
+            return
+            
+        snapshot = self._load_snapshot()
+        if snapshot is not None:
+            # Serve the snapshot right away and check it against the database in the background
+            self._publish(snapshot)
+            self.request_refresh()
+        else:
+            self.process_data()
         
+    def _make_vectorizer(self):
         # Customize TF-IDF parameters for better topic modeling
-        self.vectorizer = TfidfVectorizer(
-            stop_words='english',
-            ngram_range=(1, 2),     # Include both unigrams and bigrams
+        return TfidfVectorizer(
+            analyzer=self.analyzer, # Unigrams and bigrams of stopword-free lemmas, in one pass
             min_df=1,               # Lower this since we have fewer documents in the database
             max_df=0.85,            # Ignore terms that appear in more than 85% of documents
             sublinear_tf=True       # Apply sublinear tf scaling (1 + log(tf))
         )
-        self.process_data()
         
-    def preprocess_text(self, text):
-        """Clean and normalize text"""
-        if not isinstance(text, str):
-            return ""
-            
-        # Convert to lowercase and remove punctuation
-        text = re.sub(r'[^\w\s]', ' ', text.lower())
+    def _make_field_vectorizer(self):
+        return MultiFieldVectorizer(self._make_vectorizer, self.field_weights)
         
-        # Remove numbers
-        text = re.sub(r'\d+', '', text)
+    def _empty_supervisor_data(self):
+        return pd.DataFrame(columns=['SupervisorID', 'SvName', 'SvEmail', 'Expertise', 'expertise_phrases', 'key_terms'])
         
-        # Tokenize and lemmatize
-        tokens = text.split()
-        lemmatized = [self.lemmatizer.lemmatize(word) for word in tokens if word not in self.stopwords]
+    @property
+    def index(self):
+        """The currently published SupervisorIndex"""
+        return self._index
         
-        return ' '.join(lemmatized)
+    @property
+    def version(self):
+        return self._index.version
+        
+    @property
+    def vectorizer(self):
+        return self._index.vectorizer
+        
+    @property
+    def tfidf_matrix(self):
+        return self._index.tfidf_matrix
+        
+    @property
+    def supervisor_data(self):
+        return self._index.supervisor_data
+        
+    def preprocess_text(self, text):
+        """Clean and normalize text"""
+        return ' '.join(self.analyzer.terms(text))
         
     def get_db_connection(self):
         """Get database connection"""
-        conn = mysql.connector.connect(**db_config)
+        conn = get_connection()
         return conn, conn.cursor(dictionary=True)
         
-    def process_data(self):
-        """Process the data from database and create TF-IDF vectors"""
-        conn, cursor = self.get_db_connection()
+    def _analyze_chunks(self, chunks, columns):
+        """(rows, terms of each row) per chunk; the offline builder swaps in a process pool"""
+        for rows in chunks:
+            yield rows, analyze_rows(self.analyzer, rows, columns)
+            
+    def _stream_documents(self, supervisor_ids=None, analyze=True, analyze_chunks=None,
+                          chunk_size=STREAM_BATCH_SIZE):
+        """One streaming pass over the supervisors and every field's table
+        
+        Returns the supervisor rows, the expertise phrases and one list of terms per field and
+        supervisor, and a content hash. Texts are analyzed chunk by chunk as they arrive, so no
+        table is ever held in memory as a whole; analyze=False only computes the hash.
+        """
+        analyze_chunks = analyze_chunks or self._analyze_chunks
+        hasher = ContentHasher(*(f"{field}={weight}" for field, weight in self.field_weights.items()))
+        supervisors = {}
+        expertise = defaultdict(list)
+        terms = {field: defaultdict(list) for field in self.field_weights}
+        
+        for row in self.source.rows('supervisor', ('SvName', 'SvEmail'), supervisor_ids):
+            supervisors[row['SupervisorID']] = row
+            hasher.add('supervisor', row['SupervisorID'], row['SvName'], row['SvEmail'])
+            
+        for field in self.field_weights:
+            table, columns = FIELD_SOURCES[field]
+            
+            def known_rows():
+                for row in self.source.rows(table, columns, supervisor_ids):
+                    if row['SupervisorID'] in supervisors:
+                        hasher.add(field, row['SupervisorID'], *(row[column] for column in columns))
+                        yield row
+                        
+            if not analyze:
+                for _ in known_rows():
+                    pass
+                continue
+                
+            for rows, row_terms in analyze_chunks(chunked(known_rows(), chunk_size), columns):
+                field_terms = terms[field]
+                for row, terms_of_row in zip(rows, row_terms):
+                    field_terms[row['SupervisorID']].extend(terms_of_row)
+                    if field == 'expertise':
+                        expertise[row['SupervisorID']].append(row['Expertise'])
+            
+        return supervisors, expertise, terms, hasher.hexdigest()
+        
+    def _documents(self, streamed):
+        """Supervisor rows (sorted by id, only those with any text) and each field's aligned documents"""
+        supervisors, expertise, terms, _ = streamed
+        supervisor_ids = sorted(
+            supervisor_id for supervisor_id in supervisors
+            if any(terms[field].get(supervisor_id) for field in terms)
+        )
+        if not supervisor_ids:
+            return self._empty_supervisor_data(), {field: [] for field in terms}
+            
+        supervisor_data = pd.DataFrame({
+            'SupervisorID': supervisor_ids,
+            'SvName': [supervisors[supervisor_id]['SvName'] for supervisor_id in supervisor_ids],
+            'SvEmail': [supervisors[supervisor_id]['SvEmail'] for supervisor_id in supervisor_ids],
+            'Expertise': [' '.join(expertise.get(supervisor_id, [])) for supervisor_id in supervisor_ids],
+            'expertise_phrases': [expertise.get(supervisor_id, []) for supervisor_id in supervisor_ids]
+        })
+        field_docs = {
+            field: [field_terms.get(supervisor_id, []) for supervisor_id in supervisor_ids]
+            for field, field_terms in terms.items()
+        }
+        return supervisor_data, field_docs
+        
+    def _key_terms(self, vectorizer, tfidf_matrix):
+        # Explanations come from the first field, the supervisors' own expertise labels by default
+        field = vectorizer.fields[0]
+        return self._extract_key_terms(vectorizer.field_block(tfidf_matrix, field), vectorizer.feature_names[field])
         
+    def _build_index(self, streamed):
+        """Fit fresh per-field vectorizers and the combined TF-IDF matrix over all supervisors"""
+        supervisor_data, field_docs = self._documents(streamed)
+        
+        # Create TF-IDF matrix for every field
+        vectorizer = self._make_field_vectorizer()
+        tfidf_matrix = vectorizer.fit_transform(field_docs)
+        
+        # Add a terms column for explanation
+        supervisor_data['key_terms'] = self._key_terms(vectorizer, tfidf_matrix)
+        
+        return SupervisorIndex(vectorizer, tfidf_matrix, supervisor_data, content_hash=streamed[3], scorer=self.scorer,
+                               identity=self._identity(streamed[3]))
+        
+    def _load_snapshot(self):
+        """Rebuild a SupervisorIndex from the on-disk snapshot, if there is one"""
+        if not self.snapshot_path:
+            return None
+            
         try:
-            # Fetch supervisor data joined with expertise
-            cursor.execute("""
-                SELECT s.SupervisorID, s.SvName, s.SvEmail, e.Expertise 
-                FROM supervisor s
-                JOIN expertise e ON s.SupervisorID = e.SupervisorID
-            """)
+            snapshot = load_snapshot(self.snapshot_path)
+        except Exception as e:
+            print(f"Index snapshot load error: {e}")
+            return None
+        if snapshot is None:
+            return None
             
-            results = cursor.fetchall()
+        # A snapshot built with other fields or weights does not match this configuration
+        if [(field['name'], field['weight']) for field in snapshot['fields']] != list(self.field_weights.items()):
+            return None
             
-            # Create DataFrame from results
-            self.df = pd.DataFrame(results)
+        # Restore the fitted state without refitting
+        vectorizer = self._make_field_vectorizer()
+        for field in snapshot['fields']:
+            vectorizer.set_fitted(field['name'], field['vocabulary'], field['idf'])
+        
+        supervisor_data = pd.DataFrame(snapshot['supervisors'])
+        if snapshot['key_terms_top_n'] != self.key_terms_top_n:
+            supervisor_data['key_terms'] = self._key_terms(vectorizer, snapshot['tfidf_matrix'])
             
-            # Group by supervisor to collect all expertise areas
-            supervisor_expertise = self.df.groupby(['SupervisorID', 'SvName', 'SvEmail'])['Expertise'].apply(
-                lambda x: ' '.join(x)).reset_index()
+        # A neighbour table of a different size is recomputed once the index is published
+        neighbours, neighbour_scores = snapshot['neighbours'], snapshot['neighbour_scores']
+        if neighbours.shape[1] != SIMILAR_TOP_K:
+            neighbours, neighbour_scores = None, None
             
-            # Preprocess expertise text
-            supervisor_expertise['processed_expertise'] = supervisor_expertise['Expertise'].apply(self.preprocess_text)
+        return SupervisorIndex(vectorizer, snapshot['tfidf_matrix'], supervisor_data,
+                               content_hash=snapshot['content_hash'],
+                               neighbours=neighbours, neighbour_scores=neighbour_scores,
+                               scorer=self.scorer, lsa_components=snapshot['lsa_components'],
+                               identity=self._identity(snapshot['content_hash']))
+        
+    def _save_snapshot(self, index):
+        if not self.snapshot_path or index.content_hash is None:
+            return
             
-            # Store the processed data
-            self.supervisor_data = supervisor_expertise
+        try:
+            self._write_snapshot(index)
+        except Exception as e:
+            # A read-only or full disk only costs us the fast cold start
+            print(f"Index snapshot save error: {e}")
             
-            # Create TF-IDF matrix for the expertise
-            self.tfidf_matrix = self.vectorizer.fit_transform(self.supervisor_data['processed_expertise'])
+    def _write_snapshot(self, index):
+        """Save a fully built index to snapshot_path; errors propagate"""
+        vectorizer = index.vectorizer
+        fields = [
+            {
+                'name': field,
+                'weight': vectorizer.weights[field],
+                'vocabulary': vectorizer.feature_names[field],
+                'idf': vectorizer.vectorizers[field].idf_ if len(vectorizer.feature_names[field]) else []
+            }
+            for field in vectorizer.fields
+        ]
+        return save_snapshot(self.snapshot_path, fields, index.tfidf_matrix, index.supervisor_data,
+                             index.content_hash, self.key_terms_top_n, index.neighbours, index.neighbour_scores,
+                             lsa_components=index.lsa.components if index.lsa is not None else None)
             
-            # Add a terms column for explanation
-            feature_names = self.vectorizer.get_feature_names_out()
-            self.supervisor_data['key_terms'] = self._extract_key_terms(self.tfidf_matrix, feature_names)
+    def _rebuild(self):
+        """Refit from the database unless the published index already matches it"""
+        # Hashing alone skips text analysis, the bulk of a build, when nothing changed
+        content_hash = self._stream_documents(analyze=False)[3]
+        if self._index.content_hash == content_hash:
+            return self._index.version
+            
+        # Another worker or the offline builder may already have built and saved this exact index
+        index = self._load_snapshot()
+        if index is not None and index.content_hash == content_hash:
+            return self._publish(index)
+            
+        index = self._build_index(self._stream_documents())
+        version = self._publish(index)
+        self._save_snapshot(index)
+        return version
+        
+    def _identity(self, content_hash, patched_ids=None, parent=None):
+        """The same for the same index in every worker
+        
+        A full build is named by its configuration and source hash, a patch by its parent's identity,
+        the supervisors it patched and the hash of their rows, so workers that applied the same
+        patches to the same build agree and any other two indexes differ.
+        """
+        if parent is None:
+            key = f"{self.scorer}\x1f{self.key_terms_top_n}\x1f{content_hash}"
+        else:
+            key = f"{parent}\x1f{sorted(patched_ids)}\x1f{content_hash}"
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+        
+    def _patch_index(self, index, supervisor_ids, changed, field_docs, patch_hash):
+        """Replace, add or drop the rows of the given supervisors using the fitted vocabularies"""
+        # Supervisors missing from the stream were deleted or lost all their text
+        keep = ~index.supervisor_data['SupervisorID'].isin(supervisor_ids).to_numpy()
+        kept_rows = np.flatnonzero(keep)
+        supervisor_data = index.supervisor_data[keep]
+        tfidf_matrix = index.tfidf_matrix[kept_rows]
+        
+        if len(changed):
+            changed_matrix = index.vectorizer.transform_documents(field_docs)
+            changed['key_terms'] = self._key_terms(index.vectorizer, changed_matrix)
+            
+            supervisor_data = pd.concat([supervisor_data, changed], ignore_index=True)
+            tfidf_matrix = sp.vstack([tfidf_matrix, changed_matrix], format='csr')
+        else:
+            supervisor_data = supervisor_data.reset_index(drop=True)
+            
+        # Patched rows are projected onto the existing LSA basis rather than refitting it
+        return SupervisorIndex(index.vectorizer, tfidf_matrix, supervisor_data, patch_count=index.patch_count + 1,
+                               scorer=self.scorer,
+                               lsa_components=index.lsa.components if index.lsa is not None else None,
+                               patched_from=(index, kept_rows),
+                               identity=self._identity(patch_hash, supervisor_ids, index.identity))
+        
+    def _publish(self, index):
+        """Atomically swap in a fully built index under a new version number, then fill in its neighbour table"""
+        # Autocomplete is rebuilt with every index, before anyone can query it
+        index.prefix_index
+        with self._publish_lock:
+            self._version += 1
+            index.version = self._version
+            self._index = index
             
+        # The slowest part of a build runs while searches already use the new index; until it
+        # is done, similar() scores the one supervisor asked about directly
+        index.build_neighbours()
+        return index.version
+        
+    def process_data(self):
+        """Process the data from database and create TF-IDF vectors"""
+        try:
+            with self._refresh_lock:
+                self._rebuild()
         except Exception as e:
+            # Keep serving the previous index (the snapshot, or empty without one)
             print(f"Database error: {e}")
-            # Create empty DataFrames in case of error
-            self.supervisor_data = pd.DataFrame(columns=['SupervisorID', 'SvName', 'SvEmail', 'Expertise', 'processed_expertise'])
-            self.tfidf_matrix = None
-        finally:
-            cursor.close()
-            conn.close()
+            
+    def refresh(self, supervisor_ids=None):
+        """Rebuild the index, or patch only the rows of the given supervisors"""
+        with self._refresh_lock:
+            index = self._index
+            full_rebuild = (supervisor_ids is None
+                            or index.tfidf_matrix is None
+                            or index.patch_count >= MAX_INCREMENTAL_PATCHES)
+            
+            if full_rebuild:
+                return self._rebuild()
+                
+            supervisor_ids = set(supervisor_ids)
+            streamed = self._stream_documents(supervisor_ids)
+            changed, field_docs = self._documents(streamed)
+            # A patch would drop the new terms of an added or edited supervisor, leaving it
+            # unsearchable on them until the next refit
+            if index.vectorizer.has_unknown_terms(field_docs):
+                return self._rebuild()
+            return self._publish(self._patch_index(index, supervisor_ids, changed, field_docs, streamed[3]))
+            
+    def request_refresh(self, supervisor_ids=None):
+        """Schedule a background refresh after supervisors were added, edited or deleted"""
+        self._refresher.request(supervisor_ids)
     
-    def _extract_key_terms(self, tfidf_matrix, feature_names, top_n=5):
+    def _extract_key_terms(self, tfidf_matrix, feature_names, top_n=None):
         """Extract top terms for each document for explanation purposes"""
-        key_terms_list = []
-        
-        for i in range(tfidf_matrix.shape[0]):
-            # Get the TF-IDF scores for this document
-            feature_index = tfidf_matrix[i,:].nonzero()[1]
-            tfidf_scores = zip(feature_index, [tfidf_matrix[i, x] for x in feature_index])
+        if top_n is None:
+            top_n = self.key_terms_top_n
             
-            # Sort by score and get top terms
-            top_terms = sorted([(feature_names[i], s) for (i, s) in tfidf_scores], key=lambda x: x[1], reverse=True)[:top_n]
-            key_terms_list.append(', '.join([term for term, score in top_terms]))
+        tfidf_matrix = sp.csr_matrix(tfidf_matrix)
+        n_docs = tfidf_matrix.shape[0]
+        indptr, indices, data = tfidf_matrix.indptr, tfidf_matrix.indices, tfidf_matrix.data
+        if top_n <= 0 or data.size == 0:
+            return [''] * n_docs
             
-        return key_terms_list
+        # Order all non-zeros by row, then descending score in a single stable sort
+        row_ids = np.repeat(np.arange(n_docs), np.diff(indptr))
+        order = np.lexsort((-data, row_ids))
+        
+        # Rows stay contiguous after the sort, so the rank within a row is an offset from indptr
+        rank = np.arange(order.size) - indptr[row_ids]
+        top_terms = np.asarray(feature_names, dtype=object)[indices[order[rank < top_n]]].tolist()
+        
+        bounds = np.concatenate(([0], np.cumsum(np.minimum(np.diff(indptr), top_n)))).tolist()
+        return [', '.join(top_terms[bounds[i]:bounds[i + 1]]) for i in range(n_docs)]
+        
+    def analyze_query(self, query):
+        """Analyzed terms of a query; queries with the same terms always get the same results"""
+        return self.analyzer.terms(query)
         
     def search_supervisors(self, query, min_score=0.0, top_n=5):
-        """Find supervisors matching the query based on their expertise"""
-        # Preprocess the query
-        processed_query = self.preprocess_text(query)
+        """Find supervisors matching the query across their expertise, papers and past FYP projects"""
+        return self.search_terms(self.analyze_query(query), min_score, top_n)
+        
+    def search_terms(self, query_terms, min_score=0.0, top_n=5, index=None):
+        """Search with already analyzed query terms, optionally against a specific published index"""
+        # Work against one published index for the whole call
+        if index is None:
+            index = self._index
+        if index.tfidf_matrix is None:
+            return []
         
         # Transform query to TF-IDF vector
         try:
-            query_vector = self.vectorizer.transform([processed_query])
+            query_vector = index.vectorizer.transform([query_terms])
         except Exception as e:
             # Handle case where query terms aren't in the vocabulary
             print(f"Warning: Query processing issue - {e}")
             return []
         
         # Calculate cosine similarity between query and all expertise
-        cosine_similarities = cosine_similarity(query_vector, self.tfidf_matrix).flatten()
-        
-        # Create a dataframe with supervisors and similarity scores
-        results = pd.DataFrame({
-            'supervisor_id': self.supervisor_data['SupervisorID'],
-            'supervisor_name': self.supervisor_data['SvName'],
-            'supervisor_email': self.supervisor_data['SvEmail'],
-            'expertise': self.supervisor_data['Expertise'],
-            'similarity': cosine_similarities,
-            'key_terms': self.supervisor_data['key_terms']
-        })
+        cosine_similarities = index.score(query_vector)
+        
+        # Filter by minimum score and keep the top_n best, sorted by similarity
+        rows = top_k(cosine_similarities, min_score, top_n)
         
-        # Filter by minimum score
-        results = results[results['similarity'] > min_score]
+        # Only the winners are turned into dictionaries for JSON serialization
+        return [index.result(row, cosine_similarities[row]) for row in rows]
         
-        # Sort by similarity score in descending order
-        results = results.sort_values('similarity', ascending=False)
+    def suggest(self, prefix, limit=10):
+        """Autocomplete suggestions for a search prefix, most frequent first"""
+        return self._index.prefix_index.suggest(prefix, limit)
         
-        # Limit to top_n results if specified
-        if top_n is not None and top_n > 0:
-            results = results.head(top_n)
+    def similar_supervisors(self, supervisor_id, min_score=0.0, top_n=5):
+        """Supervisors whose combined profile is closest to the given supervisor's"""
+        return self._index.similar(supervisor_id, min_score, top_n)
+        
+    def search_supervisors_batch(self, queries, min_score=0.0, top_n=5):
+        """Run many queries with one vectorizer pass and one sparse matrix product"""
+        index = self._index
+        if index.tfidf_matrix is None or not queries:
+            return [[] for _ in queries]
+            
+        # Vectorize every query at once
+        query_matrix = index.vectorizer.transform([self.analyzer.terms(query) for query in queries])
+        similarities = index.score_batch(query_matrix)
+        
+        results = []
+        for i in range(len(queries)):
+            if min_score < 0:
+                # Zero scores are not stored in the sparse product but still pass a negative threshold
+                rows = np.arange(similarities.shape[1])
+                scores = similarities[i].toarray().ravel()
+            else:
+                start, end = similarities.indptr[i], similarities.indptr[i + 1]
+                rows, scores = similarities.indices[start:end], similarities.data[start:end]
+                
+            best = top_k(scores, min_score, top_n)
+            results.append([index.result(rows[pos], scores[pos]) for pos in best])
             
-        # Convert to list of dictionaries for JSON serialization
-        return results.to_dict('records')
+        return results
 
 # Create a singleton instance
 recommender = None
+_recommender_lock = threading.Lock()
+# Refresh signals that arrive while the first recommender is being built; its data may predate them
+_pending_lock = threading.Lock()
+_pending_ids = set()
+_pending_full_rebuild = False
 
 def get_recommender():
-    global recommender
+    global recommender, _pending_full_rebuild
     if recommender is None:
-        recommender = SupervisorRecommender()
-    return recommender
\ No newline at end of file
+        with _recommender_lock:
+            if recommender is None:
+                # Changes signalled before the build reads the data are already in it
+                with _pending_lock:
+                    _pending_ids.clear()
+                    _pending_full_rebuild = False
+                built = SupervisorRecommender()
+                with _pending_lock:
+                    recommender = built
+                    if _pending_full_rebuild:
+                        recommender.request_refresh(None)
+                    elif _pending_ids:
+                        recommender.request_refresh(set(_pending_ids))
+                    _pending_ids.clear()
+                    _pending_full_rebuild = False
+    return recommender
+
+def request_index_refresh(supervisor_ids=None):
+    """Signal that supervisor data changed; held back until the recommender exists"""
+    global _pending_full_rebuild
+    with _pending_lock:
+        if recommender is None:
+            if supervisor_ids is None:
+                _pending_full_rebuild = True
+            else:
+                _pending_ids.update(int(sid) for sid in supervisor_ids)
+            return
+    recommender.request_refresh(supervisor_ids)
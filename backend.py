@@ -1,49 +1,177 @@
+import time
+_import_started = time.perf_counter()
+
 from flask import Flask, request, render_template, redirect, url_for, session, send_from_directory, jsonify
-from AiEngine import get_recommender
 import mysql.connector
+import db
+import metrics
+import profiling
+from db import get_connection, get_pool
+from view_log import view_logger
+from caching import FileInvalidationBus, SqliteCache, TTLCache
+from responses import FastJSONProvider, choose_encoding, entry_etag, make_json_entry
 import os
+import tempfile
+import base64
+import json
 import random
-from datetime import datetime, timedelta
+import re
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 
 app = Flask(__name__)
 app.secret_key = os.urandom(24)
+# jsonify and the cached bodies are encoded by orjson when it is installed; same values as Flask's default
+# provider, with non-ASCII text left as UTF-8
+app.json = FastJSONProvider(app)
+# Request timing hooks go first so they cover every other hook
+metrics.init_app(app)
+# Admin-requested (X-FYP-Profile: 1 or ?_profile=1) and sampled cProfile runs
+profiling.init_app(app)
 
-# MySQL Configuration
-db_config = {
-    'host': 'localhost',
-    'user': 'root',
-    'password': '',  
-    'database': 'project_supervisor_rec'
+# Cache: bounded with per-namespace TTLs (namespace = key prefix before ':')
+# FYP_CACHE_BACKEND=memory keeps one LRU per worker; sqlite shares one store between all workers
+CACHE_BACKEND = os.environ.get('FYP_CACHE_BACKEND', 'memory')
+CACHE_PATH = os.environ.get('FYP_CACHE_PATH', os.path.join(tempfile.gettempdir(), 'fyp_cache.sqlite3'))
+CACHE_TIMEOUT = 300  # seconds
+CACHE_MAX_ENTRIES = int(os.environ.get('FYP_CACHE_MAX_ENTRIES', 10000))
+CACHE_MAX_BYTES = int(os.environ.get('FYP_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+CACHE_NAMESPACE_TTLS = {
+    'search': 60,
+    'supervisor_history': 60,
+    'admin_fyp_list': 60,
+    'admin_supervisors_list': 60,
+    'admin_supervisor': 60,
+    'past_fyp_page': 60,
+    'expertise_table_info': None  # schema facts never expire
+}
+# Seconds an expired entry may still be served while one request reloads it in the background
+CACHE_NAMESPACE_STALE_TTLS = {
+    'all_supervisors': 300,
+    'past_fyp_page': 300,
+    'search': 60
 }
 
-# Simple cache implementation
-cache = {}
-CACHE_TIMEOUT = 300  # seconds
+# Browsers keep API responses privately and revalidate them with If-None-Match after this many seconds
+HTTP_CACHE_MAX_AGE = int(os.environ.get('FYP_HTTP_CACHE_MAX_AGE', 0))
+
+def make_cache():
+    if CACHE_BACKEND == 'sqlite':
+        return SqliteCache(
+            CACHE_PATH,
+            max_entries=CACHE_MAX_ENTRIES,
+            default_ttl=CACHE_TIMEOUT,
+            namespace_ttls=CACHE_NAMESPACE_TTLS,
+            namespace_stale_ttls=CACHE_NAMESPACE_STALE_TTLS
+        )
+    return TTLCache(
+        max_entries=CACHE_MAX_ENTRIES,
+        max_bytes=CACHE_MAX_BYTES,
+        default_ttl=CACHE_TIMEOUT,
+        namespace_ttls=CACHE_NAMESPACE_TTLS,
+        namespace_stale_ttls=CACHE_NAMESPACE_STALE_TTLS
+    )
+
+cache = make_cache()
+
+# Log file through which a write in one worker invalidates the caches and recommender of the
+# others; unset for a single-process deployment
+INVALIDATION_BUS_PATH = os.environ.get('FYP_INVALIDATION_BUS')
+invalidation_bus = FileInvalidationBus(INVALIDATION_BUS_PATH) if INVALIDATION_BUS_PATH else None
+
+# Results kept per cached search ranking; larger top_n values are computed directly
+SEARCH_CACHE_TOP_K = int(os.environ.get('FYP_SEARCH_CACHE_TOP_K', 100))
+
+# Upper bound on queries accepted by one batch search request
+MAX_BATCH_QUERIES = 500
+
+# Past FYP catalogue page sizes
+PAST_FYP_PAGE_SIZE = 50
+PAST_FYP_MAX_PAGE_SIZE = 200
+
+# Threads assembling the parts of /api/supervisor/<id>/profile concurrently
+PROFILE_WORKERS = int(os.environ.get('FYP_PROFILE_WORKERS', 8))
+profile_executor = ThreadPoolExecutor(max_workers=PROFILE_WORKERS, thread_name_prefix='profile')
+
+def submit_profile_part(function, *args):
+    # Run in a copy of the request's context so the part's queries count toward its route in /metrics
+    return profile_executor.submit(contextvars.copy_context().run, function, *args)
+
+# The recommender stack (pandas, scikit-learn, NLTK) is imported on first use, so the
+# auth and CRUD routes boot without it
+RECOMMENDER_WARMUP = os.environ.get('FYP_RECOMMENDER_WARMUP', '1') == '1'
+_ai_engine = None
+_ai_engine_lock = threading.Lock()
+_warmup_started = False
+
+# Startup costs in seconds, reported on stdout and to admins
+startup_timings = {}
+
+def _load_ai_engine():
+    global _ai_engine
+    if _ai_engine is None:
+        with _ai_engine_lock:
+            if _ai_engine is None:
+                started = time.perf_counter()
+                import AiEngine
+                startup_timings['recommender_import'] = time.perf_counter() - started
+                print(f"Recommender stack imported in {startup_timings['recommender_import']:.2f}s")
+                _ai_engine = AiEngine
+    return _ai_engine
+
+def get_recommender():
+    return _load_ai_engine().get_recommender()
 
-# Get database connection
+def request_index_refresh(supervisor_ids=None, broadcast=True):
+    # A process that never loaded the recommender builds a fresh index on first use anyway
+    if _ai_engine is not None:
+        _ai_engine.request_index_refresh(supervisor_ids)
+    if broadcast and invalidation_bus is not None:
+        invalidation_bus.publish({
+            'type': 'index',
+            'supervisor_ids': None if supervisor_ids is None else list(supervisor_ids)
+        })
+
+def start_recommender_warmup():
+    """Import the recommender stack and build the index on a background thread"""
+    global _warmup_started
+    with _ai_engine_lock:
+        if _warmup_started:
+            return
+        _warmup_started = True
+        
+    def warm_up():
+        started = time.perf_counter()
+        try:
+            get_recommender()
+            startup_timings['recommender_ready'] = time.perf_counter() - started
+            print(f"Recommender ready in {startup_timings['recommender_ready']:.2f}s")
+        except Exception as e:
+            print(f"Recommender warm-up error: {e}")
+            
+    threading.Thread(target=warm_up, name='recommender-warmup', daemon=True).start()
+
+# Get database connection (borrowed from the shared pool; conn.close() returns it)
 def get_db_connection():
-    conn = mysql.connector.connect(**db_config)
+    conn = get_connection()
     return conn, conn.cursor(dictionary=True)
 
 # Generate random ID
 def generate_random_id():
     return random.randint(10000, 99999)
 
-# Check if student ID exists
-def is_student_id_taken(student_id):
-    conn, cursor = get_db_connection()
-    try:
-        cursor.execute("SELECT 1 FROM student WHERE StudentID = %s", (student_id,))
-        return cursor.fetchone() is not None
-    finally:
-        cursor.close()
-        conn.close()
+# Check if student ID exists, on the caller's cursor: borrowing a second pooled connection
+# while holding one can exhaust the pool under concurrent registrations
+def is_student_id_taken(cursor, student_id):
+    cursor.execute("SELECT 1 FROM student WHERE StudentID = %s", (student_id,))
+    return cursor.fetchone() is not None
 
 # Get unique student ID
-def get_unique_student_id():
+def get_unique_student_id(cursor):
     while True:
         student_id = generate_random_id()
-        if not is_student_id_taken(student_id):
+        if not is_student_id_taken(cursor, student_id):
             return student_id
 
 # Basic Routes
@@ -76,7 +204,7 @@ def register():
                 error_message = "Email already registered. Please use a different email."
             return render_template('register.html', error=error_message)
         
-        student_id = get_unique_student_id()
+        student_id = get_unique_student_id(cursor)
         cursor.execute(
             "INSERT INTO student (StudentID, StdName, StdEmail, StdPassword) VALUES (%s, %s, %s, %s)",
             (student_id, username, email, password)
@@ -136,20 +264,53 @@ def logout():
     session.clear()
     return redirect(url_for('index'))
 
-# Helper function to check and get cached data
-def get_cached_data(key, timeout=CACHE_TIMEOUT):
-    if key in cache:
-        timestamp = cache[key].get('timestamp')
-        if timestamp and (datetime.now() - timestamp) < timedelta(seconds=timeout):
-            return cache[key].get('data')
-    return None
-
-# Helper function to set cached data
-def set_cached_data(key, data):
-    cache[key] = {
-        'data': data,
-        'timestamp': datetime.now()
-    }
+# Helper function to check and get cached data (None on a miss or after the namespace TTL)
+def get_cached_data(key):
+    return cache.get(key)
+
+# Helper function to set cached data; tags let related entries be invalidated together
+def set_cached_data(key, data, tags=()):
+    cache.set(key, data, tags=tags)
+
+# Cached data, or loader() run once for all concurrent misses of key (its errors propagate)
+def get_or_load_cached_data(key, loader, tags=()):
+    return cache.get_or_load(key, loader, tags=tags)
+
+# Tag shared by every cached entry that describes one supervisor
+def supervisor_tag(supervisor_id):
+    return f"supervisor:{supervisor_id}"
+
+# Key of the serialized response cached next to a data key; same namespace, so same TTL and invalidation
+def response_key(key):
+    return f"{key}:json"
+
+# JSON response served from cached (pre-compressed) bytes, or 304 when the client already has this version.
+# With not_found set, a None payload is cached as a miss and answered with that error and a 404.
+def cached_json_response(key, build_payload, tags=(), not_found=None):
+    def load():
+        payload = build_payload()
+        if payload is None and not_found:
+            return None
+        return make_json_entry(app.json.dumps_bytes(payload))
+        
+    entry = get_or_load_cached_data(response_key(key), load, tags=tags)
+    if entry is None:
+        return jsonify({"error": not_found}), 404
+    encoding = choose_encoding(entry, request.accept_encodings)
+    etag = entry_etag(entry, encoding)
+    
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+    else:
+        response = app.response_class(entry["bodies"][encoding], mimetype='application/json')
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    response.cache_control.private = True
+    response.cache_control.max_age = HTTP_CACHE_MAX_AGE
+    response.cache_control.must_revalidate = True
+    return response
 
 # API Routes
 @app.route('/supervisor_picture/<filename>')
@@ -167,10 +328,15 @@ def get_all_supervisors():
         return jsonify({"error": "Unauthorized"}), 401
     
     cache_key = "all_supervisors"
-    cached_data = get_cached_data(cache_key)
-    if cached_data:
-        return jsonify({"supervisors": cached_data})
-        
+    try:
+        return cached_json_response(
+            cache_key, lambda: {"supervisors": get_or_load_cached_data(cache_key, load_all_supervisors)}
+        )
+    except mysql.connector.Error as err:
+        print(f"Database error: {err}")
+        return jsonify({"error": str(err)}), 500
+
+def load_all_supervisors():
     conn, cursor = get_db_connection()
     try:
         cursor.execute("""
@@ -180,14 +346,7 @@ def get_all_supervisors():
             GROUP BY s.SupervisorID
             ORDER BY s.SvName
         """)
-        
-        supervisors = cursor.fetchall()
-        set_cached_data(cache_key, supervisors)
-        
-        return jsonify({"supervisors": supervisors})
-    except mysql.connector.Error as err:
-        print(f"Database error: {err}")
-        return jsonify({"error": str(err)}), 500
+        return cursor.fetchall()
     finally:
         cursor.close()
         conn.close()
@@ -203,53 +362,124 @@ def get_supervisor(supervisor_id):
     if 'username' not in session:
         return jsonify({"error": "Unauthorized"}), 401
     
-    # Log supervisor view
+    # Log supervisor view (queued; written in batches by the view log writer)
     if 'user_id' in session:
-        log_supervisor_view(session['user_id'], supervisor_id)
+        view_logger.record(session['user_id'], supervisor_id)
     
-    cache_key = f"supervisor:{supervisor_id}"
-    cached_data = get_cached_data(cache_key)
-    if cached_data:
-        return jsonify(cached_data)
-        
-    conn, cursor = get_db_connection()
     try:
-        cursor.execute("""
-            SELECT s.SupervisorID, s.SvName, s.SvEmail, GROUP_CONCAT(e.Expertise SEPARATOR ', ') as expertise_areas
-            FROM supervisor s
-            LEFT JOIN expertise e ON s.SupervisorID = e.SupervisorID
-            WHERE s.SupervisorID = %s
-            GROUP BY s.SupervisorID
-        """, (supervisor_id,))
+        # The supervisor is only loaded when the serialized response is not cached
+        return cached_json_response(f"supervisor:{supervisor_id}", lambda: load_supervisor(supervisor_id) or None,
+                                    tags=[supervisor_tag(supervisor_id)], not_found="Supervisor not found")
+    except mysql.connector.Error as err:
+        print(f"Database error: {err}")
+        return jsonify({"error": str(err)}), 500
+
+@app.route('/api/supervisor/<int:supervisor_id>/profile', methods=['GET'])
+def get_supervisor_profile(supervisor_id):
+    if 'username' not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+    
+    # Log supervisor view (queued; written in batches by the view log writer)
+    if 'user_id' in session:
+        view_logger.record(session['user_id'], supervisor_id)
         
-        supervisor = cursor.fetchone()
-        if not supervisor:
+    min_score = float(request.args.get('min_score', 0.3))
+    top_n = int(request.args.get('top_n', 4))
+    
+    # Each part is cached on its own; the misses run side by side
+    supervisor = submit_profile_part(load_supervisor, supervisor_id)
+    papers = submit_profile_part(load_supervisor_papers, supervisor_id)
+    projects = submit_profile_part(load_supervisor_fyp, supervisor_id)
+    similar = submit_profile_part(load_similar_supervisors, supervisor_id, min_score, top_n)
+    
+    try:
+        if not supervisor.result():
             return jsonify({"error": "Supervisor not found"}), 404
             
-        set_cached_data(cache_key, supervisor)
-        return jsonify(supervisor)
+        return jsonify({
+            "supervisor": supervisor.result(),
+            "papers": papers.result(),
+            "projects": projects.result(),
+            "similar": similar.result()
+        })
     except mysql.connector.Error as err:
         print(f"Database error: {err}")
         return jsonify({"error": str(err)}), 500
-    finally:
-        cursor.close()
-        conn.close()
 
-def log_supervisor_view(student_id, supervisor_id):
-    conn, cursor = get_db_connection()
-    try:
-        cursor.execute("""
-            INSERT INTO supervisor_views (StudentID, SupervisorID, view_count, last_viewed)
-            VALUES (%s, %s, 1, NOW())
-            ON DUPLICATE KEY UPDATE view_count = view_count + 1, last_viewed = NOW()
-        """, (student_id, supervisor_id))
+def load_supervisor(supervisor_id):
+    def load():
+        conn, cursor = get_db_connection()
+        try:
+            cursor.execute("""
+                SELECT s.SupervisorID, s.SvName, s.SvEmail, GROUP_CONCAT(e.Expertise SEPARATOR ', ') as expertise_areas
+                FROM supervisor s
+                LEFT JOIN expertise e ON s.SupervisorID = e.SupervisorID
+                WHERE s.SupervisorID = %s
+                GROUP BY s.SupervisorID
+            """, (supervisor_id,))
+            return cursor.fetchone()
+        finally:
+            cursor.close()
+            conn.close()
             
-        conn.commit()
-    except mysql.connector.Error as err:
-        print(f"Database error in log_supervisor_view: {err}")
-    finally:
-        cursor.close()
-        conn.close()
+    return get_or_load_cached_data(f"supervisor:{supervisor_id}", load, tags=[supervisor_tag(supervisor_id)])
+
+def load_supervisor_papers(supervisor_id):
+    def load():
+        conn, cursor = get_db_connection()
+        try:
+            cursor.execute("""
+                SELECT PaperTitle, PaperYear, PaperAbstract, PaperKeywords, SupervisorID
+                FROM papers
+                WHERE SupervisorID = %s
+                ORDER BY PaperYear DESC, PaperTitle
+            """, (supervisor_id,))
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+            conn.close()
+            
+    return get_or_load_cached_data(f"supervisor_papers:{supervisor_id}", load, tags=[supervisor_tag(supervisor_id)])
+
+def load_supervisor_fyp(supervisor_id):
+    def load():
+        conn, cursor = get_db_connection()
+        try:
+            cursor.execute("""
+                SELECT p.ProjectID, p.Title, p.Author, p.Abstract, p.Year
+                FROM past_fyp p
+                WHERE p.SupervisorID = %s
+                ORDER BY p.Year DESC, p.Title
+            """, (supervisor_id,))
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+            conn.close()
+            
+    return get_or_load_cached_data(f"supervisor_fyp:{supervisor_id}", load, tags=[supervisor_tag(supervisor_id)])
+
+def load_similar_supervisors(supervisor_id, min_score, top_n):
+    # A profile still renders while the recommender is unavailable
+    try:
+        return get_recommender().similar_supervisors(supervisor_id, min_score, top_n)
+    except Exception as e:
+        print(f"Similar supervisors error: {e}")
+        return []
+
+@app.route('/api/supervisor/<int:supervisor_id>/similar', methods=['GET'])
+def get_similar_supervisors(supervisor_id):
+    if 'username' not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+        
+    min_score = float(request.args.get('min_score', 0.0))
+    top_n = int(request.args.get('top_n', 5))
+    
+    try:
+        results = get_recommender().similar_supervisors(supervisor_id, min_score, top_n)
+        return jsonify({"results": results})
+    except Exception as e:
+        print(f"Similar supervisors error: {e}")
+        return jsonify({"error": str(e)}), 500
 
 @app.route('/supervisor_list.html')
 def supervisor_list():
@@ -268,29 +498,161 @@ def past_fyp():
     if 'username' not in session:
         return redirect(url_for('index'))
     
-    cache_key = "past_fyp_projects"
-    cached_data = get_cached_data(cache_key)
-    if cached_data:
-        return render_template('past_fyp.html', projects=cached_data)
-    
-    conn, cursor = get_db_connection()
+    return render_template('past_fyp.html')
+
+@app.route('/api/past_fyp', methods=['GET'])
+def get_past_fyp_page():
+    if 'username' not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+        
     try:
-        cursor.execute("""
-            SELECT ProjectID, Title, Author, Abstract, Year 
-            FROM past_fyp
-            ORDER BY year DESC, Author
-        """)
+        filters = {
+            'q': request.args.get('q', '').strip(),
+            'title': request.args.get('title', '').strip(),
+            'author': request.args.get('author', '').strip(),
+            'year': int(request.args['year']) if request.args.get('year') else None,
+            'supervisor_id': int(request.args['supervisor_id']) if request.args.get('supervisor_id') else None
+        }
+        limit = min(max(int(request.args.get('limit', PAST_FYP_PAGE_SIZE)), 1), PAST_FYP_MAX_PAGE_SIZE)
+        after = decode_fyp_cursor(request.args.get('after'))
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid filter, limit or cursor"}), 400
         
-        fyp_projects = cursor.fetchall()
-        set_cached_data(cache_key, fyp_projects)
+    cache_key = "past_fyp_page:" + json.dumps([filters, limit, after], sort_keys=True)
+    try:
+        page = get_or_load_cached_data(cache_key, lambda: load_past_fyp_page(filters, limit, after))
+        return jsonify(page)
+    except mysql.connector.Error as err:
+        print(f"Database error: {err}")
+        return jsonify({"error": str(err)}), 500
+
+@app.route('/api/past_fyp/<int:project_id>/abstract', methods=['GET'])
+def get_past_fyp_abstract(project_id):
+    if 'username' not in session:
+        return jsonify({"error": "Unauthorized"}), 401
         
-        return render_template('past_fyp.html', projects=fyp_projects)
+    def load():
+        conn, cursor = get_db_connection()
+        try:
+            cursor.execute("SELECT ProjectID, Abstract FROM past_fyp WHERE ProjectID = %s", (project_id,))
+            return cursor.fetchone()
+        finally:
+            cursor.close()
+            conn.close()
+            
+    try:
+        project = get_or_load_cached_data(f"past_fyp_abstract:{project_id}", load)
+        if not project:
+            return jsonify({"error": "Project not found"}), 404
+        return jsonify(project)
     except mysql.connector.Error as err:
         print(f"Database error: {err}")
-        return render_template('past_fyp.html', error="Failed to load projects", projects=[])
+        return jsonify({"error": str(err)}), 500
+
+# Opaque keyset cursor: the (Year, Author, ProjectID) of the last row of a page; Year and Author may be NULL
+def encode_fyp_cursor(project):
+    key = json.dumps([project['Year'], project['Author'], project['ProjectID']])
+    return base64.urlsafe_b64encode(key.encode('utf-8')).decode('ascii')
+
+def decode_fyp_cursor(cursor_value):
+    if not cursor_value:
+        return None
+    year, author, project_id = json.loads(base64.urlsafe_b64decode(cursor_value.encode('ascii')))
+    return [None if year is None else int(year), None if author is None else str(author), int(project_id)]
+
+# Catalogue order is Year DESC, Author, ProjectID. MySQL sorts NULL as the smallest value, so NULL
+# years come last and NULL authors first; these predicates follow the same order
+def fyp_after(column, value, descending):
+    """SQL and params for rows strictly after value in the column's sort order"""
+    if value is None:
+        return ("FALSE", []) if descending else (f"{column} IS NOT NULL", [])
+    if descending:
+        return f"({column} < %s OR {column} IS NULL)", [value]
+    return f"{column} > %s", [value]
+
+def fyp_equal(column, value):
+    if value is None:
+        return f"{column} IS NULL", []
+    return f"{column} = %s", [value]
+
+def fyp_keyset_condition(after):
+    """Rows after the cursor: a later year, the same year and a later author, or both the same and a later id"""
+    year, author, project_id = after
+    year_after, year_after_params = fyp_after("Year", year, True)
+    year_equal, year_equal_params = fyp_equal("Year", year)
+    author_after, author_after_params = fyp_after("Author", author, False)
+    author_equal, author_equal_params = fyp_equal("Author", author)
+    condition = f"({year_after} OR ({year_equal} AND ({author_after} OR ({author_equal} AND ProjectID > %s))))"
+    params = [*year_after_params, *year_equal_params, *author_after_params, *author_equal_params, project_id]
+    return condition, params
+
+FULLTEXT_WORD_RE = re.compile(r'\w+')
+
+# User text matched literally inside a LIKE pattern
+def like_escape(text):
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def load_past_fyp_page(filters, limit, after):
+    """One catalogue page; the indexes it relies on are created by sql/past_fyp_indexes.sql"""
+    conditions = []
+    params = []
+    
+    # Every word of the free-text box must start a word of the title or author (the FULLTEXT
+    # index); a four digit term is a year
+    fulltext_terms = []
+    for term in filters['q'].split():
+        if term.isdigit() and len(term) == 4:
+            conditions.append("Year = %s")
+            params.append(int(term))
+        else:
+            # Only word characters, so user input never reads as a boolean-mode operator
+            fulltext_terms.extend(f"+{word}*" for word in FULLTEXT_WORD_RE.findall(term))
+    if fulltext_terms:
+        conditions.append("MATCH (Title, Author) AGAINST (%s IN BOOLEAN MODE)")
+        params.append(' '.join(fulltext_terms))
+
+    if filters['title']:
+        conditions.append("Title LIKE %s")
+        params.append(f"{like_escape(filters['title'])}%")
+    if filters['author']:
+        conditions.append("Author LIKE %s")
+        params.append(f"{like_escape(filters['author'])}%")
+    if filters['year'] is not None:
+        conditions.append("Year = %s")
+        params.append(filters['year'])
+    if filters['supervisor_id'] is not None:
+        conditions.append("SupervisorID = %s")
+        params.append(filters['supervisor_id'])
+        
+    # Keyset pagination in (Year DESC, Author, ProjectID) order: no OFFSET scans on deep pages
+    if after is not None:
+        condition, condition_params = fyp_keyset_condition(after)
+        conditions.append(condition)
+        params.extend(condition_params)
+        
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    
+    conn, cursor = get_db_connection()
+    try:
+        cursor.execute(f"""
+            SELECT ProjectID, Title, Author, Year, SupervisorID
+            FROM past_fyp
+            {where}
+            ORDER BY Year DESC, Author, ProjectID
+            LIMIT %s
+        """, (*params, limit + 1))
+        projects = cursor.fetchall()
     finally:
         cursor.close()
         conn.close()
+        
+    has_more = len(projects) > limit
+    projects = projects[:limit]
+    return {
+        "projects": projects,
+        "has_more": has_more,
+        "next_cursor": encode_fyp_cursor(projects[-1]) if has_more else None
+    }
 
 @app.route('/api/search_supervisors', methods=['GET'])
 def search_supervisors():
@@ -301,21 +663,76 @@ def search_supervisors():
     min_score = float(request.args.get('min_score', 0.1))
     top_n = int(request.args.get('top_n', 5))
     
-    cache_key = f"search:{query}:{min_score}:{top_n}"
-    cached_data = get_cached_data(cache_key, timeout=60)
-    if cached_data:
-        return jsonify({"results": cached_data})
-    
     try:
         recommender = get_recommender()
-        results = recommender.search_supervisors(query, min_score, top_n)
-        set_cached_data(cache_key, results)
+        index = recommender.index
+        query_terms = recommender.analyze_query(query)
+        
+        def rank(min_score, top_n):
+            with metrics.SCORING_SECONDS.time('search'):
+                return recommender.search_terms(query_terms, min_score, top_n, index)
+        
+        if min_score < 0 or not 0 < top_n <= SEARCH_CACHE_TOP_K:
+            # Zero scores or an unbounded list are not in the cached ranking
+            results = rank(min_score, top_n)
+        else:
+            # One ranking per analyzed query and index; every min_score/top_n is a slice of it. The
+            # identity, unlike the per-process version, names the same index in every worker
+            cache_key = f"search:{index.identity}:{' '.join(query_terms)}"
+            ranked = get_or_load_cached_data(cache_key, lambda: rank(0.0, SEARCH_CACHE_TOP_K))
+            results = [result for result in ranked if result['similarity'] > min_score][:top_n]
         
         return jsonify({"results": results})
     except Exception as e:
         print(f"Search error: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/suggest', methods=['GET'])
+def suggest():
+    if 'username' not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+        
+    prefix = request.args.get('prefix', '')
+    try:
+        limit = int(request.args.get('limit', 10))
+    except ValueError:
+        return jsonify({"error": "limit must be a number"}), 400
+    
+    # Answered from the in-memory prefix index of the live search index; no cache or database
+    try:
+        return jsonify({"suggestions": get_recommender().suggest(prefix, limit)})
+    except Exception as e:
+        print(f"Suggest error: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/search_supervisors/batch', methods=['POST'])
+def search_supervisors_batch():
+    if 'username' not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+        
+    data = request.get_json(silent=True) or {}
+    queries = data.get('queries')
+    if not isinstance(queries, list) or not all(isinstance(query, str) for query in queries):
+        return jsonify({"error": "queries must be a list of strings"}), 400
+    if len(queries) > MAX_BATCH_QUERIES:
+        return jsonify({"error": f"At most {MAX_BATCH_QUERIES} queries are allowed per batch"}), 400
+        
+    try:
+        min_score = float(data.get('min_score', 0.1))
+        top_n = int(data.get('top_n', 5))
+    except (TypeError, ValueError):
+        return jsonify({"error": "min_score and top_n must be numbers"}), 400
+    
+    try:
+        recommender = get_recommender()
+        with metrics.SCORING_SECONDS.time('batch'):
+            results = recommender.search_supervisors_batch(queries, min_score, top_n)
+        
+        return jsonify({"results": results})
+    except Exception as e:
+        print(f"Batch search error: {e}")
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/api/student_profile', methods=['GET'])
 def get_student_profile():
     if 'username' not in session or 'user_id' not in session:
@@ -323,7 +740,7 @@ def get_student_profile():
     
     cache_key = f"student_profile:{session['user_id']}"
     cached_data = get_cached_data(cache_key)
-    if cached_data:
+    if cached_data is not None:
         return jsonify(cached_data)
         
     conn, cursor = get_db_connection()
@@ -356,8 +773,8 @@ def get_supervisor_history():
         return jsonify({"error": "Unauthorized"}), 401
     
     cache_key = f"supervisor_history:{session['user_id']}"
-    cached_data = get_cached_data(cache_key, timeout=60)
-    if cached_data:
+    cached_data = get_cached_data(cache_key)
+    if cached_data is not None:
         return jsonify(cached_data)
             
     conn, cursor = get_db_connection()
@@ -407,60 +824,26 @@ def get_supervisor_fyp(supervisor_id):
     if 'username' not in session:
         return jsonify({"error": "Unauthorized"}), 401
     
-    cache_key = f"supervisor_fyp:{supervisor_id}"
-    cached_data = get_cached_data(cache_key)
-    if cached_data:
-        return jsonify({"projects": cached_data})
-        
-    conn, cursor = get_db_connection()
     try:
-        cursor.execute("""
-            SELECT p.ProjectID, p.Title, p.Author, p.Abstract, p.Year
-            FROM past_fyp p
-            WHERE p.SupervisorID = %s
-            ORDER BY p.Year DESC, p.Title
-        """, (supervisor_id,))
-        
-        projects = cursor.fetchall()
-        set_cached_data(cache_key, projects)
-        
-        return jsonify({"projects": projects})
+        return cached_json_response(f"supervisor_fyp:{supervisor_id}",
+                                    lambda: {"projects": load_supervisor_fyp(supervisor_id)},
+                                    tags=[supervisor_tag(supervisor_id)])
     except mysql.connector.Error as err:
         print(f"Database error: {err}")
         return jsonify({"error": str(err)}), 500
-    finally:
-        cursor.close()
-        conn.close()
         
 @app.route('/api/supervisor_papers/<int:supervisor_id>', methods=['GET'])
 def get_supervisor_papers(supervisor_id):
     if 'username' not in session:
         return jsonify({"error": "Unauthorized"}), 401
    
-    cache_key = f"supervisor_papers:{supervisor_id}"
-    cached_data = get_cached_data(cache_key)
-    if cached_data:
-        return jsonify({"projects": cached_data})
-       
-    conn, cursor = get_db_connection()
     try:
-        cursor.execute("""
-            SELECT PaperTitle, PaperYear, PaperAbstract, PaperKeywords, SupervisorID
-            FROM papers
-            WHERE SupervisorID = %s
-            ORDER BY PaperYear DESC, PaperTitle
-        """, (supervisor_id,))
-       
-        projects = cursor.fetchall()
-        set_cached_data(cache_key, projects)
-       
-        return jsonify({"projects": projects})
+        return cached_json_response(f"supervisor_papers:{supervisor_id}",
+                                    lambda: {"projects": load_supervisor_papers(supervisor_id)},
+                                    tags=[supervisor_tag(supervisor_id)])
     except mysql.connector.Error as err:
         print(f"Database error: {err}")
         return jsonify({"error": str(err)}), 500
-    finally:
-        cursor.close()
-        conn.close()
 
 @app.route('/admin/login', methods=['POST'])
 def admin_login():
@@ -503,17 +886,44 @@ def admin_supervisors_page():
         return redirect(url_for('index'))
     return render_template('admin_supervisors.html')
 
-# Helper function to clear cache
-def clear_cache(keys=None, patterns=None):
-    if keys:
-        for key in keys:
-            cache.pop(key, None)
+# Helper function to clear cache by exact key, whole namespace or tag (no keyspace scan)
+def clear_cache(keys=None, namespaces=None, tags=None, broadcast=True):
+    # A data key takes its serialized response (and so its ETag) with it
+    cached_keys = [cached for key in keys or () for cached in (key, response_key(key))]
+    cache.invalidate(keys=cached_keys, namespaces=namespaces or (), tags=tags or ())
     
-    if patterns:
-        for pattern in patterns:
-            matches = [k for k in cache if k.startswith(pattern)]
-            for key in matches:
-                cache.pop(key, None)
+    # A shared cache is already clean for every worker
+    if broadcast and invalidation_bus is not None and not cache.shared:
+        invalidation_bus.publish({
+            'type': 'cache',
+            'keys': list(keys or ()),
+            'namespaces': list(namespaces or ()),
+            'tags': list(tags or ())
+        })
+
+# Apply cache and index invalidations published by other workers
+def apply_remote_invalidations():
+    for event in invalidation_bus.poll():
+        event_type = event.get('type')
+        if event_type == 'cache':
+            clear_cache(event.get('keys'), event.get('namespaces'), event.get('tags'), broadcast=False)
+        elif event_type == 'index':
+            request_index_refresh(event.get('supervisor_ids'), broadcast=False)
+        elif event_type == 'reset':
+            # Some events were lost to log rotation; start over
+            cache.clear()
+            request_index_refresh(None, broadcast=False)
+
+# Whether expertise.ExpertiseID is AUTO_INCREMENT (looked up once, then cached)
+def has_expertise_auto_increment(cursor):
+    has_auto_increment = get_cached_data('expertise_table_info')
+    if has_auto_increment is None:
+        cursor.execute("DESCRIBE expertise")
+        has_auto_increment = any('auto_increment' in col.get('Extra', '').lower() 
+                                 for col in cursor.fetchall() 
+                                 if col.get('Field') == 'ExpertiseID')
+        set_cached_data('expertise_table_info', has_auto_increment)
+    return has_auto_increment
 
 @app.route('/api/admin/fyp', methods=['GET', 'POST'])
 def admin_fyp():
@@ -521,29 +931,18 @@ def admin_fyp():
         return jsonify({"error": "Unauthorized"}), 401
     
     cache_key = "admin_fyp_list"
+    if request.method == 'GET':
+        # Served from the cached body without a database connection while it is fresh
+        try:
+            return cached_json_response(cache_key, lambda: {"projects": load_admin_fyp_list()})
+        except mysql.connector.Error as err:
+            print(f"Database error: {err}")
+            return jsonify({"error": str(err)}), 500
+    
     conn, cursor = get_db_connection()
     
     try:
-        if request.method == 'GET':
-            if cache_key in cache and (datetime.now() - cache[cache_key]['timestamp']).seconds < 60:
-                return jsonify({"projects": cache[cache_key]['data']})
-                
-            cursor.execute("""
-                SELECT p.*, s.SvName as SupervisorName
-                FROM past_fyp p
-                LEFT JOIN supervisor s ON p.SupervisorID = s.SupervisorID
-                ORDER BY p.Year DESC, p.Title
-            """)
-            projects = cursor.fetchall()
-            
-            cache[cache_key] = {
-                'data': projects,
-                'timestamp': datetime.now()
-            }
-            
-            return jsonify({"projects": projects})
-        
-        elif request.method == 'POST':
+        if request.method == 'POST':
             data = request.json
             
             cursor.execute("SELECT MAX(ProjectID) as max_id FROM past_fyp")
@@ -565,9 +964,12 @@ def admin_fyp():
             
             # Clear relevant caches
             clear_cache(
-                keys=["admin_fyp_list", "past_fyp_projects"],
-                patterns=[f"supervisor_fyp:{data.get('SupervisorID')}"]
+                keys=["admin_fyp_list", f"supervisor_fyp:{data.get('SupervisorID')}"],
+                namespaces=["past_fyp_page"]
             )
+            # Past projects are one of the fields supervisors are matched on
+            if data.get('SupervisorID'):
+                request_index_refresh([data.get('SupervisorID')])
             
             return jsonify({"success": True, "message": "Project added successfully", "projectId": next_id})
     
@@ -578,6 +980,20 @@ def admin_fyp():
         cursor.close()
         conn.close()
 
+def load_admin_fyp_list():
+    conn, cursor = get_db_connection()
+    try:
+        cursor.execute("""
+            SELECT p.*, s.SvName as SupervisorName
+            FROM past_fyp p
+            LEFT JOIN supervisor s ON p.SupervisorID = s.SupervisorID
+            ORDER BY p.Year DESC, p.Title
+        """)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
 @app.route('/api/admin/fyp/<int:project_id>', methods=['GET', 'PUT', 'DELETE'])
 def admin_fyp_detail(project_id):
     if 'admin_username' not in session:
@@ -622,16 +1038,16 @@ def admin_fyp_detail(project_id):
                 return jsonify({"success": False, "error": "Project not found"}), 404
             
             # Clear caches
-            cache_keys = ["admin_fyp_list", "past_fyp_projects"]
-            patterns = []
+            cache_keys = ["admin_fyp_list", f"past_fyp_abstract:{project_id}"]
             
             if old_supervisor_id:
-                patterns.append(f"supervisor_fyp:{old_supervisor_id}")
+                cache_keys.append(f"supervisor_fyp:{old_supervisor_id}")
             
             if new_supervisor_id and new_supervisor_id != old_supervisor_id:
-                patterns.append(f"supervisor_fyp:{new_supervisor_id}")
+                cache_keys.append(f"supervisor_fyp:{new_supervisor_id}")
             
-            clear_cache(keys=cache_keys, patterns=patterns)
+            clear_cache(keys=cache_keys, namespaces=["past_fyp_page"])
+            request_index_refresh([sid for sid in (old_supervisor_id, new_supervisor_id) if sid])
             
             return jsonify({"success": True, "message": "Project updated successfully"})
         
@@ -648,13 +1064,14 @@ def admin_fyp_detail(project_id):
                 return jsonify({"success": False, "error": "Project not found"}), 404
             
             # Clear caches
-            cache_keys = ["admin_fyp_list", "past_fyp_projects"]
-            patterns = []
+            cache_keys = ["admin_fyp_list", f"past_fyp_abstract:{project_id}"]
             
             if supervisor_id:
-                patterns.append(f"supervisor_fyp:{supervisor_id}")
+                cache_keys.append(f"supervisor_fyp:{supervisor_id}")
             
-            clear_cache(keys=cache_keys, patterns=patterns)
+            clear_cache(keys=cache_keys, namespaces=["past_fyp_page"])
+            if supervisor_id:
+                request_index_refresh([supervisor_id])
             
             return jsonify({"success": True, "message": "Project deleted successfully"})
     
@@ -671,36 +1088,17 @@ def admin_supervisors():
         return jsonify({"error": "Unauthorized"}), 401
     
     cache_key = "admin_supervisors_list"
+    if request.method == 'GET':
+        try:
+            return cached_json_response(cache_key, lambda: {"supervisors": load_admin_supervisors_list()})
+        except mysql.connector.Error as err:
+            print(f"Database error: {err}")
+            return jsonify({"error": str(err)}), 500
+    
     conn, cursor = get_db_connection()
     
     try:
-        if request.method == 'GET':
-            if cache_key in cache and (datetime.now() - cache[cache_key]['timestamp']).seconds < 60:
-                return jsonify({"supervisors": cache[cache_key]['data']})
-                
-            cursor.execute("""
-                SELECT s.SupervisorID, s.SvName, s.SvEmail, 
-                       GROUP_CONCAT(DISTINCT e.Expertise SEPARATOR ', ') as expertise_areas
-                FROM supervisor s
-                LEFT JOIN expertise e ON s.SupervisorID = e.SupervisorID
-                GROUP BY s.SupervisorID, s.SvName, s.SvEmail
-                ORDER BY s.SvName
-            """)
-            supervisors = cursor.fetchall()
-            
-            # Ensure no null values for expertise
-            for supervisor in supervisors:
-                if supervisor['expertise_areas'] is None:
-                    supervisor['expertise_areas'] = ''
-            
-            cache[cache_key] = {
-                'data': supervisors,
-                'timestamp': datetime.now()
-            }
-                    
-            return jsonify({"supervisors": supervisors})
-        
-        elif request.method == 'POST':
+        if request.method == 'POST':
             data = request.json
             
             # Start transaction
@@ -726,20 +1124,7 @@ def admin_supervisors():
                 expertise_list = [x.strip() for x in data['expertise'].split(',') if x.strip()]
                 
                 # Check for auto-increment
-                if 'expertise_table_info' not in cache:
-                    cursor.execute("DESCRIBE expertise")
-                    has_auto_increment = any('auto_increment' in col.get('Extra', '').lower() 
-                                         for col in cursor.fetchall() 
-                                         if col.get('Field') == 'ExpertiseID')
-                    
-                    cache['expertise_table_info'] = {
-                        'has_auto_increment': has_auto_increment,
-                        'timestamp': datetime.now()
-                    }
-                else:
-                    has_auto_increment = cache['expertise_table_info']['has_auto_increment']
-                
-                if has_auto_increment:
+                if has_expertise_auto_increment(cursor):
                     # Batch insert with auto-increment
                     values = [(new_supervisor_id, expertise) for expertise in expertise_list]
                     cursor.executemany("""
@@ -763,8 +1148,10 @@ def admin_supervisors():
             # Clear caches
             clear_cache(
                 keys=["all_supervisors", "admin_supervisors_list"],
-                patterns=[f"supervisor:{new_supervisor_id}", "search:"]
+                namespaces=["search"],
+                tags=[supervisor_tag(new_supervisor_id)]
             )
+            request_index_refresh([new_supervisor_id])
             
             return jsonify({"success": True, "message": "Supervisor added successfully"})
     
@@ -777,6 +1164,28 @@ def admin_supervisors():
         cursor.close()
         conn.close()
 
+def load_admin_supervisors_list():
+    conn, cursor = get_db_connection()
+    try:
+        cursor.execute("""
+            SELECT s.SupervisorID, s.SvName, s.SvEmail, 
+                   GROUP_CONCAT(DISTINCT e.Expertise SEPARATOR ', ') as expertise_areas
+            FROM supervisor s
+            LEFT JOIN expertise e ON s.SupervisorID = e.SupervisorID
+            GROUP BY s.SupervisorID, s.SvName, s.SvEmail
+            ORDER BY s.SvName
+        """)
+        supervisors = cursor.fetchall()
+        
+        # Ensure no null values for expertise
+        for supervisor in supervisors:
+            if supervisor['expertise_areas'] is None:
+                supervisor['expertise_areas'] = ''
+        return supervisors
+    finally:
+        cursor.close()
+        conn.close()
+
 @app.route('/api/admin/supervisors/<int:supervisor_id>', methods=['GET', 'PUT', 'DELETE'])
 def admin_supervisor_detail(supervisor_id):
     if 'admin_username' not in session:
@@ -787,8 +1196,9 @@ def admin_supervisor_detail(supervisor_id):
     
     try:
         if request.method == 'GET':
-            if cache_key in cache and (datetime.now() - cache[cache_key]['timestamp']).seconds < 60:
-                return jsonify({"supervisor": cache[cache_key]['data']})
+            cached_data = get_cached_data(cache_key)
+            if cached_data is not None:
+                return jsonify({"supervisor": cached_data})
             
             cursor.execute("""
                 SELECT s.SupervisorID, s.SvName, s.SvEmail, 
@@ -803,10 +1213,7 @@ def admin_supervisor_detail(supervisor_id):
             if not supervisor:
                 return jsonify({"error": "Supervisor not found"}), 404
             
-            cache[cache_key] = {
-                'data': supervisor,
-                'timestamp': datetime.now()
-            }
+            set_cached_data(cache_key, supervisor, tags=[supervisor_tag(supervisor_id)])
                 
             return jsonify({"supervisor": supervisor})
         
@@ -837,20 +1244,7 @@ def admin_supervisor_detail(supervisor_id):
                     expertise_list = [x.strip() for x in data['expertise'].split(',') if x.strip()]
                     
                     # Check for auto-increment (use cached info if available)
-                    if 'expertise_table_info' not in cache:
-                        cursor.execute("DESCRIBE expertise")
-                        has_auto_increment = any('auto_increment' in col.get('Extra', '').lower() 
-                                             for col in cursor.fetchall() 
-                                             if col.get('Field') == 'ExpertiseID')
-                        
-                        cache['expertise_table_info'] = {
-                            'has_auto_increment': has_auto_increment,
-                            'timestamp': datetime.now()
-                        }
-                    else:
-                        has_auto_increment = cache['expertise_table_info']['has_auto_increment']
-                    
-                    if has_auto_increment:
+                    if has_expertise_auto_increment(cursor):
                         # Batch insert with auto-increment
                         values = [(supervisor_id, expertise) for expertise in expertise_list]
                         cursor.executemany("""
@@ -873,9 +1267,11 @@ def admin_supervisor_detail(supervisor_id):
             
             # Clear caches
             clear_cache(
-                keys=["all_supervisors", "admin_supervisors_list", cache_key],
-                patterns=[f"supervisor:{supervisor_id}", f"supervisor_fyp:{supervisor_id}", "search:"]
+                keys=["all_supervisors", "admin_supervisors_list"],
+                namespaces=["search"],
+                tags=[supervisor_tag(supervisor_id)]
             )
+            request_index_refresh([supervisor_id])
             
             return jsonify({"success": True, "message": "Supervisor updated successfully"})
         
@@ -909,9 +1305,11 @@ def admin_supervisor_detail(supervisor_id):
             
             # Clear caches
             clear_cache(
-                keys=["all_supervisors", "admin_supervisors_list", cache_key],
-                patterns=[f"supervisor:{supervisor_id}", f"supervisor_fyp:{supervisor_id}", "search:"]
+                keys=["all_supervisors", "admin_supervisors_list"],
+                namespaces=["search"],
+                tags=[supervisor_tag(supervisor_id)]
             )
+            request_index_refresh([supervisor_id])
                 
             return jsonify({"success": True, "message": "Supervisor deleted successfully"})
     
@@ -924,24 +1322,52 @@ def admin_supervisor_detail(supervisor_id):
         cursor.close()
         conn.close()
 
-# Clean cache periodically (simplified)
+@app.route('/api/admin/db_pool', methods=['GET'])
+def admin_db_pool():
+    if 'admin_username' not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+    return jsonify({"pool": get_pool().stats()})
+
+@app.route('/api/admin/startup_timings', methods=['GET'])
+def admin_startup_timings():
+    if 'admin_username' not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+    return jsonify({"timings": startup_timings})
+
+@app.route('/api/admin/view_log', methods=['GET'])
+def admin_view_log():
+    if 'admin_username' not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+    return jsonify({"view_log": view_logger.stats()})
+
+@app.route('/api/admin/cache_stats', methods=['GET'])
+def admin_cache_stats():
+    if 'admin_username' not in session:
+        return jsonify({"error": "Unauthorized"}), 401
+    return jsonify({"cache": cache.stats()})
+
+# Expired cache entries are dropped on access and evicted in LRU order, so no periodic sweep is needed
 @app.before_request
 def before_request():
-    # Clean expired cache entries every 100 requests
-    global request_counter
-    request_counter = getattr(app, 'request_counter', 0) + 1
-    setattr(app, 'request_counter', request_counter)
-    
-    if request_counter >= 100:
-        now = datetime.now()
-        expired_keys = [key for key, value in cache.items() 
-                      if isinstance(value, dict) and 'timestamp' in value 
-                      and (now - value['timestamp']).seconds > 600]
+    # Build the recommender off the request path once the app is serving
+    if RECOMMENDER_WARMUP and not _warmup_started:
+        start_recommender_warmup()
         
-        for key in expired_keys:
-            cache.pop(key, None)
-            
-        setattr(app, 'request_counter', 0)
+    # One stat() of the bus log when nothing changed
+    if invalidation_bus is not None:
+        apply_remote_invalidations()
+
+# Scrape-time views of the cache, pool and view log, and per-request query counting
+if metrics.METRICS_ENABLED:
+    db.set_query_observer(metrics.observe_query)
+    metrics.registry.register_collector(metrics.cache_collector(cache))
+    metrics.registry.register_collector(metrics.stats_collector(
+        'fyp_db_pool', 'Connection pool', lambda: get_pool().stats(), gauges=('size', 'in_use', 'idle', 'utilization')))
+    metrics.registry.register_collector(metrics.stats_collector(
+        'fyp_view_log', 'Supervisor view log writer', view_logger.stats, gauges=('pending',)))
+
+startup_timings['app_import'] = time.perf_counter() - _import_started
+print(f"App imported in {startup_timings['app_import']:.2f}s")
 
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
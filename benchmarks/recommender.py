@@ -0,0 +1,213 @@
+"""Recommender micro-benchmarks over synthetic corpora
+
+Run from the repository root (no database needed; the NLTK corpora must be installed):
+
+    python -m benchmarks.recommender --output bench_results.json
+    python -m benchmarks.recommender --sizes 1000 --compare bench_results.json
+    python -m benchmarks.recommender --sizes 10000 --scorers tfidf,lsa
+    python -m benchmarks.recommender --sizes 100000 --no-memory --output bench_100k.json
+
+The default sizes finish in a few minutes. 100k supervisors is a long run: on one core its build
+alone took about 12 minutes with a 3.3 GB peak RSS, and the tracemalloc pass builds it a second time.
+
+Every size is built from an in-memory source seeded from expertise.csv. Results are written
+as JSON; --compare prints the relative change of each metric against an earlier run. With
+several scorers, each one's top-10 recall against the exact TF-IDF ranking is reported too.
+"""
+import argparse
+import gc
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import sklearn
+
+from AiEngine import FIELD_WEIGHTS, LSA_COMPONENTS, SupervisorRecommender
+from benchmarks.synthetic import sample_queries, seed_phrases, synthetic_source
+
+# Depth of the rankings compared between scorers
+RECALL_AT = 10
+
+# Metrics compared by --compare, and whether a larger value is better
+COMPARED_METRICS = {
+    'build_seconds': False,
+    'key_terms_seconds': False,
+    'query_p50_ms': False,
+    'query_p99_ms': False,
+    'batch_queries_per_second': True,
+    'peak_memory_mb': False
+}
+
+def build(source, scorer):
+    # No snapshot: every run measures a full build
+    return SupervisorRecommender(snapshot_path=None, source=source, scorer=scorer)
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+def bench_size(n_supervisors, n_queries, batch_size, measure_memory, seed, phrases, scorer='tfidf'):
+    """Metrics of one corpus size and scorer, plus each query's top RECALL_AT supervisor ids"""
+    source = synthetic_source(n_supervisors, seed=seed, phrases=phrases)
+    queries = sample_queries(n_queries, seed=seed, phrases=phrases)
+
+    gc.collect()
+    recommender, build_seconds = timed(build, source, scorer)
+    index = recommender.index
+
+    # Key terms on their own, as the build and every patch run them
+    field = index.vectorizer.fields[0]
+    block = index.vectorizer.field_block(index.tfidf_matrix, field)
+    _, key_terms_seconds = timed(recommender._extract_key_terms, block, index.vectorizer.feature_names[field])
+
+    # Per-query latency through the public search path
+    recommender.search_supervisors(queries[0])
+    latencies = []
+    for query in queries:
+        _, seconds = timed(recommender.search_supervisors, query, 0.1, 5)
+        latencies.append(seconds * 1000)
+
+    rankings = [
+        [result['supervisor_id'] for result in recommender.search_supervisors(query, 0.0, RECALL_AT)]
+        for query in queries
+    ]
+
+    batches = [queries[start:start + batch_size] for start in range(0, len(queries), batch_size)]
+    started = time.perf_counter()
+    for batch in batches:
+        recommender.search_supervisors_batch(batch, 0.1, 5)
+    batch_seconds = time.perf_counter() - started
+
+    result = {
+        'supervisors': n_supervisors,
+        'scorer': scorer,
+        'lsa_components': index.lsa.components.shape[0] if index.lsa is not None else None,
+        'matrix_shape': list(index.tfidf_matrix.shape),
+        'matrix_nnz': int(index.tfidf_matrix.nnz),
+        'build_seconds': build_seconds,
+        'key_terms_seconds': key_terms_seconds,
+        'queries': len(queries),
+        'query_mean_ms': float(np.mean(latencies)),
+        'query_p50_ms': float(np.percentile(latencies, 50)),
+        'query_p90_ms': float(np.percentile(latencies, 90)),
+        'query_p99_ms': float(np.percentile(latencies, 99)),
+        'batch_size': batch_size,
+        'batch_queries_per_second': len(queries) / batch_seconds if batch_seconds else None,
+        'peak_memory_mb': None
+    }
+    del recommender, index, block
+
+    if measure_memory:
+        # A second build under tracemalloc; its slowdown stays out of the timings above
+        gc.collect()
+        tracemalloc.start()
+        recommender = build(source, scorer)
+        result['peak_memory_mb'] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+        del recommender
+
+    return result, rankings
+
+def recall(rankings, exact_rankings):
+    """Mean share of the exact top results that a ranking also returns"""
+    shares = [len(set(ranking) & set(exact)) / len(exact)
+              for ranking, exact in zip(rankings, exact_rankings) if exact]
+    return float(np.mean(shares)) if shares else None
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, previous):
+    """Print each metric next to the same size in an earlier run"""
+    earlier = {(result['supervisors'], result.get('scorer', 'tfidf')): result for result in previous['results']}
+    for result in results:
+        before = earlier.get((result['supervisors'], result['scorer']))
+        if before is None:
+            continue
+        print(f"\n{result['supervisors']} supervisors ({result['scorer']}) vs {previous['meta'].get('git_revision')}:")
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old * 100
+            worse = change < 0 if higher_is_better else change > 0
+            print(f"  {metric:26} {old:12.4f} -> {new:12.4f}  {change:+7.1f}%{'  (worse)' if worse else ''}")
+
+def print_scorer_report(results):
+    """Side-by-side latency and recall of every scorer at every size"""
+    recall_key = f'recall_at_{RECALL_AT}_vs_tfidf'
+    print(f"\n{'supervisors':>11} {'scorer':>7} {'build s':>9} {'p50 ms':>8} {'p99 ms':>8} "
+          f"{'batch q/s':>10} {'recall@' + str(RECALL_AT):>10}")
+    for result in results:
+        recall_value = result[recall_key]
+        print(f"{result['supervisors']:>11} {result['scorer']:>7} {result['build_seconds']:>9.2f} "
+              f"{result['query_p50_ms']:>8.2f} {result['query_p99_ms']:>8.2f} "
+              f"{result['batch_queries_per_second']:>10.0f} "
+              f"{'-' if recall_value is None else f'{recall_value:.3f}':>10}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000', help='comma-separated supervisor counts')
+    parser.add_argument('--queries', type=int, default=500, help='queries timed per size')
+    parser.add_argument('--batch-size', type=int, default=100, help='queries per batch search call')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--scorers', default='tfidf', help='comma-separated scorers to run (tfidf, lsa)')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc build')
+    parser.add_argument('--output', default='bench_results.json', help='where to write the JSON results')
+    parser.add_argument('--compare', help='earlier results file to compare against')
+    args = parser.parse_args(argv)
+
+    phrases = seed_phrases()
+    scorers = args.scorers.split(',')
+    results = []
+    for size in (int(size) for size in args.sizes.split(',')):
+        exact_rankings = None
+        for scorer in scorers:
+            print(f"Benchmarking {size} supervisors ({scorer})...", flush=True)
+            result, rankings = bench_size(size, args.queries, args.batch_size, not args.no_memory, args.seed,
+                                          phrases, scorer)
+            if scorer == 'tfidf':
+                exact_rankings = rankings
+            result[f'recall_at_{RECALL_AT}_vs_tfidf'] = recall(rankings, exact_rankings) if exact_rankings else None
+            print(f"  build {result['build_seconds']:.2f}s, key terms {result['key_terms_seconds'] * 1000:.1f}ms, "
+                  f"query p50 {result['query_p50_ms']:.2f}ms p99 {result['query_p99_ms']:.2f}ms, "
+                  f"batch {result['batch_queries_per_second']:.0f} q/s", flush=True)
+            results.append(result)
+
+    if len(scorers) > 1:
+        print_scorer_report(results)
+
+    report = {
+        'meta': {
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'sklearn': sklearn.__version__,
+            'field_weights': FIELD_WEIGHTS,
+            'lsa_components': LSA_COMPONENTS,
+            'seed': args.seed
+        },
+        'results': results
+    }
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(results, json.load(f))
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,62 @@
+import os
+import random
+import re
+from data_sources import MemorySource
+
+SEED_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'expertise.csv')
+
+_WORD_RE = re.compile(r'[A-Za-z]+')
+
+def seed_phrases(path=SEED_CSV):
+    """The distinct expertise phrases of the bundled export"""
+    source = MemorySource.from_expertise_csv(path)
+    return sorted({row['Expertise'].strip() for row in source.tables['expertise'] if row['Expertise'].strip()})
+
+def synthetic_source(n_supervisors, seed=0, phrases=None, papers_per_supervisor=2, projects_per_supervisor=1):
+    """A MemorySource of n supervisors whose texts are drawn from the seed phrases
+
+    Most expertise entries are real phrases; the rest join two seed words into a new one, so the
+    vocabulary keeps growing with the corpus instead of saturating at the seed's few hundred terms.
+    """
+    rng = random.Random(seed)
+    phrases = phrases or seed_phrases()
+    words = sorted({word.lower() for phrase in phrases for word in _WORD_RE.findall(phrase)})
+    invented = [rng.choice(words) + rng.choice(words) for _ in range(max(50, n_supervisors // 10))]
+
+    def phrase():
+        if rng.random() < 0.8:
+            return rng.choice(phrases)
+        return f"{rng.choice(words)} {rng.choice(invented)}".upper()
+
+    def sentence(n_words):
+        return ' '.join(rng.choice(words if rng.random() < 0.9 else invented) for _ in range(n_words))
+
+    tables = {'supervisor': [], 'expertise': [], 'papers': [], 'past_fyp': []}
+    for supervisor_id in range(1, n_supervisors + 1):
+        tables['supervisor'].append({
+            'SupervisorID': supervisor_id,
+            'SvName': f"Supervisor {supervisor_id}",
+            'SvEmail': f"supervisor{supervisor_id}@example.com"
+        })
+        for _ in range(rng.randint(2, 8)):
+            tables['expertise'].append({'SupervisorID': supervisor_id, 'Expertise': phrase()})
+        for _ in range(papers_per_supervisor):
+            tables['papers'].append({
+                'SupervisorID': supervisor_id,
+                'PaperTitle': sentence(rng.randint(5, 12)),
+                'PaperKeywords': '; '.join(phrase().lower() for _ in range(3)),
+                'PaperAbstract': sentence(rng.randint(40, 80))
+            })
+        for _ in range(projects_per_supervisor):
+            tables['past_fyp'].append({
+                'SupervisorID': supervisor_id,
+                'Title': sentence(rng.randint(4, 10)),
+                'Abstract': sentence(rng.randint(30, 60))
+            })
+    return MemorySource(tables)
+
+def sample_queries(n_queries, seed=0, phrases=None):
+    """Search strings like students type them: one to three seed phrases, mixed case"""
+    rng = random.Random(seed + 1)
+    phrases = phrases or seed_phrases()
+    return [' '.join(rng.choice(phrases) for _ in range(rng.randint(1, 3))).title() for _ in range(n_queries)]
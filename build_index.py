@@ -0,0 +1,89 @@
+"""Build the supervisor search index offline and write it as a snapshot
+
+    python build_index.py                              # from MySQL (db.db_config)
+    python build_index.py --csv expertise.csv --output /tmp/csv_index   # trial build, not for serving
+    python build_index.py --workers 8 --output /srv/fyp/index_snapshot
+
+Text analysis runs in a process pool, chunk by chunk, while rows stream in. Web workers pointed
+at the same snapshot directory (FYP_INDEX_SNAPSHOT) load it at startup, and only hash the
+database to confirm it is current instead of building their own index.
+
+An expertise export has no supervisor names, emails, papers or projects, so a --csv build uses
+placeholder names and can never match the database; it needs an explicit --output and is only
+good for trying the builder out.
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from AiEngine import (FIELD_WEIGHTS, INDEX_SNAPSHOT_PATH, SupervisorRecommender, analyze_rows,
+                      parse_field_weights)
+from data_sources import STREAM_BATCH_SIZE, MemorySource
+
+# Set in each worker process by init_worker
+_analyzer = None
+
+def init_worker(analyzer):
+    global _analyzer
+    _analyzer = analyzer
+
+def analyze_chunk(rows, columns):
+    return analyze_rows(_analyzer, rows, columns)
+
+def parallel_analysis(executor, window):
+    """An analyze_chunks replacement that keeps up to window chunks in flight, results in order"""
+    def analyze_chunks(chunks, columns):
+        pending = deque()
+        for rows in chunks:
+            pending.append((rows, executor.submit(analyze_chunk, rows, columns)))
+            if len(pending) >= window:
+                rows, future = pending.popleft()
+                yield rows, future.result()
+        while pending:
+            rows, future = pending.popleft()
+            yield rows, future.result()
+    return analyze_chunks
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build the supervisor search index snapshot offline')
+    parser.add_argument('--csv', help="read supervisors and expertise from a ';'-separated export instead of MySQL")
+    parser.add_argument('--output', help=f'snapshot directory (default: {INDEX_SNAPSHOT_PATH}; required with --csv)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='analysis processes')
+    parser.add_argument('--chunk-size', type=int, default=STREAM_BATCH_SIZE, help='rows per analysis task')
+    parser.add_argument('--field-weights', help='e.g. expertise=1,papers=0.5 (default: FYP_FIELD_WEIGHTS)')
+    args = parser.parse_args(argv)
+    if args.csv and not args.output:
+        parser.error("--csv builds use placeholder supervisor names; give an --output away from the served snapshot")
+    if args.csv:
+        print(f"Warning: {args.output} will hold placeholder supervisor names and emails; "
+              f"it is not ready to serve", file=sys.stderr)
+
+    field_weights = parse_field_weights(args.field_weights) if args.field_weights else FIELD_WEIGHTS
+    source = MemorySource.from_expertise_csv(args.csv) if args.csv else None
+    recommender = SupervisorRecommender(snapshot_path=args.output or INDEX_SNAPSHOT_PATH,
+                                        field_weights=field_weights, source=source, autoload=False)
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker,
+                             initargs=(recommender.analyzer,)) as executor:
+        analyze_chunks = parallel_analysis(executor, window=2 * args.workers)
+        streamed = recommender._stream_documents(analyze_chunks=analyze_chunks, chunk_size=args.chunk_size)
+    analyzed = time.perf_counter()
+
+    index = recommender._build_index(streamed)
+    if index.tfidf_matrix.shape[0] == 0:
+        print("No supervisors with any indexed text; nothing written", file=sys.stderr)
+        return 1
+    index.build_neighbours()
+    snapshot_dir = recommender._write_snapshot(index)
+    finished = time.perf_counter()
+
+    print(f"Indexed {index.tfidf_matrix.shape[0]} supervisors, {index.tfidf_matrix.shape[1]} terms "
+          f"(analysis {analyzed - started:.1f}s, fit {finished - analyzed:.1f}s) into {snapshot_dir}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,689 @@
+import collections
+import json
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+
+# Default lifetime of an entry in seconds; None means it never expires
+DEFAULT_TTL = 300
+
+_DEFAULT = object()
+
+# Freshness of a looked-up entry
+_FRESH, _STALE, _MISSING = 'fresh', 'stale', 'missing'
+
+def _new_counters():
+    return {
+        'hits': 0, 'misses': 0, 'sets': 0, 'evictions': 0, 'expirations': 0, 'invalidations': 0,
+        'stale_hits': 0, 'loads': 0, 'coalesced': 0, 'errors': 0
+    }
+
+def namespace_of(key):
+    """The namespace of a key is its prefix before the first ':'"""
+    return key.split(':', 1)[0]
+
+def estimate_size(value, _depth=0):
+    """Rough deep size in bytes of the JSON-like values we cache"""
+    size = sys.getsizeof(value)
+    if _depth > 8:
+        return size
+    if isinstance(value, dict):
+        size += sum(estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(estimate_size(item, _depth + 1) for item in value)
+    return size
+
+class _Call:
+    __slots__ = ('done', 'value', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.waiters = 0
+
+class SingleFlight:
+    """Run at most one loader per key at a time; concurrent callers share its result"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, loader):
+        """Return (value, shared) where shared says another caller's load was reused"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        self._run(key, call, loader)
+        if call.error is not None:
+            raise call.error
+        return call.value, False
+
+    def do_async(self, key, loader):
+        """Start loader on a daemon thread unless a load of key is already running"""
+        with self._lock:
+            if key in self._calls:
+                return False
+            call = self._calls[key] = _Call()
+
+        threading.Thread(target=self._run, args=(key, call, loader), name=f'cache-refresh-{key}',
+                         daemon=True).start()
+        return True
+
+    def _run(self, key, call, loader):
+        try:
+            call.value = loader()
+        except Exception as e:
+            call.error = e
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+class _LoadingCache:
+    """get_or_load() on top of a backend's _lookup()/set(): single-flight misses, stale-while-revalidate"""
+    def _init_loading(self, stale_ttl, namespace_stale_ttls):
+        self.stale_ttl = stale_ttl
+        self.namespace_stale_ttls = dict(namespace_stale_ttls or {})
+        self._flights = SingleFlight()
+        # Bumped by every invalidation so a load that raced a write is not stored (SqliteCache keeps
+        # its generation in the file instead)
+        self._generation = 0
+
+    def ttl_for(self, key):
+        return self.namespace_ttls.get(namespace_of(key), self.default_ttl)
+
+    def stale_ttl_for(self, key):
+        return self.namespace_stale_ttls.get(namespace_of(key), self.stale_ttl)
+
+    def get_or_load(self, key, loader, ttl=_DEFAULT, tags=()):
+        """Return the cached value, loading it once however many callers miss at the same time
+
+        An entry past its TTL but inside its stale window is returned as is while one
+        background thread reloads it. Loader errors propagate to every waiting caller.
+        """
+        value, state = self._lookup(key)
+        if state == _FRESH:
+            return value
+
+        namespace = namespace_of(key)
+        if state == _STALE:
+            self._count(namespace, 'stale_hits')
+            self._flights.do_async(key, lambda: self._load(key, loader, ttl, tags))
+            return value
+
+        value, shared = self._flights.do(key, lambda: self._load(key, loader, ttl, tags))
+        if shared:
+            self._count(namespace, 'coalesced')
+        return value
+
+    def _load(self, key, loader, ttl, tags):
+        generation = self._current_generation()
+        try:
+            value = loader()
+        except Exception as e:
+            print(f"Cache load error for {key}: {e}")
+            raise
+        self._count(namespace_of(key), 'loads')
+
+        self._store_loaded(key, value, ttl, tags, generation)
+        return value
+
+    def _current_generation(self):
+        return self._generation
+
+    def _store_loaded(self, key, value, ttl, tags, generation):
+        # Store a loaded value unless an invalidation happened since the load started
+        if generation == self._generation:
+            self.set(key, value, ttl=ttl, tags=tags)
+
+    def _expiry(self, key, ttl, now):
+        # (expires_at, stale_until) for an entry stored now
+        if ttl is _DEFAULT:
+            ttl = self.ttl_for(key)
+        if ttl is None:
+            return None, None
+        return now + ttl, now + ttl + (self.stale_ttl_for(key) or 0)
+
+class _Entry:
+    __slots__ = ('value', 'expires_at', 'stale_until', 'size', 'namespace', 'tags')
+
+    def __init__(self, value, expires_at, stale_until, size, namespace, tags):
+        self.value = value
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+        self.size = size
+        self.namespace = namespace
+        self.tags = tags
+
+class TTLCache(_LoadingCache):
+    """Thread-safe LRU cache with per-namespace TTLs, tag invalidation and hit/miss counters"""
+    # Entries live in this process only; other workers learn about writes through an InvalidationBus
+    shared = False
+
+    def __init__(self, max_entries=10000, max_bytes=None, default_ttl=DEFAULT_TTL, namespace_ttls=None,
+                 stale_ttl=0, namespace_stale_ttls=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.namespace_ttls = dict(namespace_ttls or {})
+        self._init_loading(stale_ttl, namespace_stale_ttls)
+
+        self._lock = threading.RLock()
+        # Least recently used first
+        self._entries = collections.OrderedDict()
+        # Secondary indexes so invalidation never scans the whole keyspace
+        self._by_namespace = collections.defaultdict(set)
+        self._by_tag = collections.defaultdict(set)
+        self._bytes = 0
+        self._stats = collections.defaultdict(_new_counters)
+
+    def get(self, key, default=None):
+        """Return the cached value, or default when missing or expired"""
+        value, state = self._lookup(key)
+        return value if state == _FRESH else default
+
+    def _lookup(self, key):
+        namespace = namespace_of(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats[namespace]['misses'] += 1
+                return None, _MISSING
+
+            now = time.monotonic()
+            if entry.expires_at is not None and entry.expires_at <= now:
+                self._stats[namespace]['misses'] += 1
+                if entry.stale_until > now:
+                    return entry.value, _STALE
+                self._remove(key)
+                self._stats[namespace]['expirations'] += 1
+                return None, _MISSING
+
+            self._entries.move_to_end(key)
+            self._stats[namespace]['hits'] += 1
+            return entry.value, _FRESH
+
+    def set(self, key, value, ttl=_DEFAULT, tags=()):
+        """Store a value; ttl defaults to the namespace TTL and tags allow grouped invalidation"""
+        expires_at, stale_until = self._expiry(key, ttl, time.monotonic())
+        size = estimate_size(value) if self.max_bytes else 0
+        namespace = namespace_of(key)
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            entry = _Entry(value, expires_at, stale_until, size, namespace, frozenset(tags))
+            self._entries[key] = entry
+            self._by_namespace[namespace].add(key)
+            for tag in entry.tags:
+                self._by_tag[tag].add(key)
+            self._bytes += size
+            self._stats[namespace]['sets'] += 1
+
+            self._evict()
+
+    def invalidate(self, keys=(), namespaces=(), tags=()):
+        """Drop the given keys, every key of the given namespaces and every key carrying a tag"""
+        with self._lock:
+            self._generation += 1
+            doomed = set(keys)
+            for namespace in namespaces:
+                doomed.update(self._by_namespace.get(namespace, ()))
+            for tag in tags:
+                doomed.update(self._by_tag.get(tag, ()))
+
+            removed = 0
+            for key in doomed:
+                entry = self._remove(key)
+                if entry is not None:
+                    self._stats[entry.namespace]['invalidations'] += 1
+                    removed += 1
+            return removed
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._by_namespace.clear()
+            self._by_tag.clear()
+            self._bytes = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (entry.expires_at is None or entry.expires_at > time.monotonic())
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Entry/byte usage and per-namespace counters"""
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'namespaces': {namespace: dict(counters) for namespace, counters in self._stats.items()}
+            }
+
+    def _count(self, namespace, counter, amount=1):
+        with self._lock:
+            self._stats[namespace][counter] += amount
+
+    def _evict(self):
+        # Drop least recently used entries until both caps are respected
+        while self._entries and (
+                (self.max_entries is not None and len(self._entries) > self.max_entries)
+                or (self.max_bytes and self._bytes > self.max_bytes)):
+            key = next(iter(self._entries))
+            entry = self._remove(key)
+            self._stats[entry.namespace]['evictions'] += 1
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+
+        self._bytes -= entry.size
+        keys = self._by_namespace.get(entry.namespace)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_namespace[entry.namespace]
+        for tag in entry.tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+        return entry
+
+class SqliteCache(_LoadingCache):
+    """Cache shared by every worker on the host, kept in one SQLite file (oldest-first eviction)"""
+    shared = True
+
+    # Bump when the table layout changes; an older cache file is simply recreated
+    SCHEMA_VERSION = 3
+
+    # Check the entry cap every this many writes rather than on each one
+    EVICT_EVERY = 100
+
+    def __init__(self, path, max_entries=10000, default_ttl=DEFAULT_TTL, namespace_ttls=None,
+                 stale_ttl=0, namespace_stale_ttls=None):
+        self.path = path
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.namespace_ttls = dict(namespace_ttls or {})
+        self._init_loading(stale_ttl, namespace_stale_ttls)
+
+        # sqlite3 connections must not cross threads or a fork
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._stats = collections.defaultdict(_new_counters)
+
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        with self._transaction() as conn:
+            if conn.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS cache_entries")
+                conn.execute("DROP TABLE IF EXISTS cache_tags")
+                conn.execute("DROP TABLE IF EXISTS cache_meta")
+                conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    key TEXT PRIMARY KEY,
+                    namespace TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    expires_at REAL,
+                    stale_until REAL,
+                    stored_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_entries_namespace ON cache_entries (namespace)")
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_entries_stored_at ON cache_entries (stored_at)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_tags (
+                    tag TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    PRIMARY KEY (tag, key)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_tags_key ON cache_tags (key)")
+            # The invalidation generation lives in the file so that every worker sees every bump
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_meta (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+            """)
+            conn.execute("INSERT OR IGNORE INTO cache_meta (name, value) VALUES ('generation', 0)")
+
+    def get(self, key, default=None):
+        """Return the cached value, or default when missing, expired or unreadable"""
+        value, state = self._lookup(key)
+        return value if state == _FRESH else default
+
+    def _lookup(self, key):
+        namespace = namespace_of(key)
+        try:
+            row = self._connection().execute(
+                "SELECT value, expires_at, stale_until FROM cache_entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._count(namespace, 'misses')
+                return None, _MISSING
+
+            blob, expires_at, stale_until = row
+            now = time.time()
+            state = _FRESH
+            if expires_at is not None and expires_at <= now:
+                self._count(namespace, 'misses')
+                if stale_until <= now:
+                    self._delete(keys=[key])
+                    self._count(namespace, 'expirations')
+                    return None, _MISSING
+                state = _STALE
+            value = pickle.loads(blob)
+        except (sqlite3.Error, pickle.UnpicklingError) as e:
+            print(f"Shared cache read error: {e}")
+            self._count(namespace, 'errors')
+            return None, _MISSING
+
+        if state == _FRESH:
+            self._count(namespace, 'hits')
+        return value, state
+
+    def set(self, key, value, ttl=_DEFAULT, tags=()):
+        """Store a value; ttl defaults to the namespace TTL and tags allow grouped invalidation"""
+        self._write(key, value, ttl, tags)
+
+    def _current_generation(self):
+        try:
+            return self._read_generation(self._connection())
+        except sqlite3.Error as e:
+            print(f"Shared cache read error: {e}")
+            return None
+
+    def _store_loaded(self, key, value, ttl, tags, generation):
+        if generation is not None:
+            self._write(key, value, ttl, tags, generation=generation)
+
+    def _write(self, key, value, ttl, tags, generation=None):
+        # With a generation, the write is dropped if any worker invalidated since it was read
+        now = time.time()
+        expires_at, stale_until = self._expiry(key, ttl, now)
+        namespace = namespace_of(key)
+
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            with self._transaction() as conn:
+                if generation is not None and self._read_generation(conn) != generation:
+                    return
+                conn.execute("DELETE FROM cache_tags WHERE key = ?", (key,))
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache_entries (key, namespace, value, expires_at, stale_until, stored_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", (key, namespace, blob, expires_at, stale_until, now))
+                conn.executemany("INSERT OR IGNORE INTO cache_tags (tag, key) VALUES (?, ?)",
+                                 [(tag, key) for tag in set(tags)])
+        except (sqlite3.Error, pickle.PicklingError) as e:
+            print(f"Shared cache write error: {e}")
+            self._count(namespace, 'errors')
+            return
+        self._count(namespace, 'sets')
+
+        with self._lock:
+            self._writes += 1
+            evict = self._writes % self.EVICT_EVERY == 0
+        if evict:
+            self._evict()
+
+    def invalidate(self, keys=(), namespaces=(), tags=()):
+        """Drop the given keys, every key of the given namespaces and every key carrying a tag"""
+        try:
+            removed = self._delete(keys=keys, namespaces=namespaces, tags=tags, invalidation=True)
+        except sqlite3.Error as e:
+            print(f"Shared cache invalidation error: {e}")
+            return 0
+        for namespace, count in removed.items():
+            self._count(namespace, 'invalidations', count)
+        return sum(removed.values())
+
+    def clear(self):
+        try:
+            with self._transaction() as conn:
+                self._bump_generation(conn)
+                conn.execute("DELETE FROM cache_entries")
+                conn.execute("DELETE FROM cache_tags")
+        except sqlite3.Error as e:
+            print(f"Shared cache clear error: {e}")
+
+    def __contains__(self, key):
+        row = self._connection().execute(
+            "SELECT expires_at FROM cache_entries WHERE key = ?", (key,)).fetchone()
+        return row is not None and (row[0] is None or row[0] > time.time())
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+
+    def stats(self):
+        """Entry usage of the shared file and this process's per-namespace counters"""
+        with self._lock:
+            namespaces = {namespace: dict(counters) for namespace, counters in self._stats.items()}
+        return {
+            'backend': 'sqlite',
+            'path': self.path,
+            'entries': len(self),
+            'max_entries': self.max_entries,
+            'namespaces': namespaces
+        }
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _transaction(self):
+        return _SqliteTransaction(self._connection())
+
+    def _read_generation(self, conn):
+        return conn.execute("SELECT value FROM cache_meta WHERE name = 'generation'").fetchone()[0]
+
+    def _bump_generation(self, conn):
+        conn.execute("UPDATE cache_meta SET value = value + 1 WHERE name = 'generation'")
+
+    def _delete(self, keys=(), namespaces=(), tags=(), invalidation=False):
+        # Returns removed entry counts per namespace; an invalidation also bumps the shared generation
+        removed = collections.Counter()
+        with self._transaction() as conn:
+            if invalidation:
+                self._bump_generation(conn)
+            doomed = set(keys)
+            for tag in tags:
+                doomed.update(key for (key,) in conn.execute("SELECT key FROM cache_tags WHERE tag = ?", (tag,)))
+            for key in doomed:
+                removed[namespace_of(key)] += conn.execute(
+                    "DELETE FROM cache_entries WHERE key = ?", (key,)).rowcount
+                conn.execute("DELETE FROM cache_tags WHERE key = ?", (key,))
+            for namespace in namespaces:
+                removed[namespace] += conn.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ?", (namespace,)).rowcount
+            if namespaces:
+                conn.execute("DELETE FROM cache_tags WHERE key NOT IN (SELECT key FROM cache_entries)")
+        return removed
+
+    def _evict(self):
+        # Drop expired entries, then the oldest ones beyond the cap
+        try:
+            with self._transaction() as conn:
+                conn.execute("DELETE FROM cache_entries WHERE stale_until IS NOT NULL AND stale_until <= ?",
+                             (time.time(),))
+                if self.max_entries is not None:
+                    overflow = conn.execute(
+                        "SELECT key, namespace FROM cache_entries ORDER BY stored_at DESC LIMIT -1 OFFSET ?",
+                        (self.max_entries,)).fetchall()
+                    for key, namespace in overflow:
+                        conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                        self._count(namespace, 'evictions')
+                conn.execute("DELETE FROM cache_tags WHERE key NOT IN (SELECT key FROM cache_entries)")
+        except sqlite3.Error as e:
+            print(f"Shared cache eviction error: {e}")
+
+    def _count(self, namespace, counter, amount=1):
+        with self._lock:
+            self._stats[namespace][counter] += amount
+
+class _SqliteTransaction:
+    """BEGIN IMMEDIATE ... COMMIT, rolled back on error"""
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.conn.execute("COMMIT")
+        else:
+            self.conn.execute("ROLLBACK")
+        return False
+
+class FileInvalidationBus:
+    """Broadcast invalidation events to every worker on the host through an append-only log file"""
+    def __init__(self, path, max_bytes=1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        # Holding the log open keeps a rotated file readable and its inode from being reused
+        self._file = None
+        self._inode = None
+        self._pending = b''
+
+        # New workers start at the end of the log; there is nothing stale for them to drop yet
+        try:
+            self._open(seek_end=True)
+        except FileNotFoundError:
+            pass
+
+    def publish(self, event):
+        """Append one event; small O_APPEND writes reach the file whole even with concurrent writers"""
+        line = (json.dumps(dict(event, origin=os.getpid()), default=str) + '\n').encode('utf-8')
+        try:
+            self._rotate_if_full()
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            print(f"Invalidation bus publish error: {e}")
+
+    def poll(self):
+        """Events published by other processes since the last poll; {'type': 'reset'} if some were lost"""
+        # Another thread is already draining the log; its caller applies the events
+        if not self._lock.acquire(blocking=False):
+            return []
+        try:
+            try:
+                st = os.stat(self.path)
+            except FileNotFoundError:
+                return []
+
+            if st.st_ino == self._inode:
+                if st.st_size == self._file.tell():
+                    return []
+                lines = self._read()
+            else:
+                # Rotated (or created): finish the file we hold, then read the new one from the start
+                lines = self._read() if self._file is not None else []
+                previous = self._inode
+                self._close()
+                try:
+                    self._open(seek_end=False)
+                except FileNotFoundError:
+                    return []
+                new_lines = self._read()
+                if previous is not None and not self._continues(new_lines, previous):
+                    lines.append(json.dumps({'type': 'reset'}))
+                lines.extend(new_lines)
+
+            events = []
+            pid = os.getpid()
+            for line in lines:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                if event.get('type') != 'rotated' and event.get('origin') != pid:
+                    events.append(event)
+            return events
+        finally:
+            self._lock.release()
+
+    def _rotate_if_full(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        if st.st_size <= self.max_bytes:
+            return
+
+        os.replace(self.path, self.path + '.1')
+        try:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            return
+        try:
+            # Lets readers verify they did not miss a whole file between two polls
+            os.write(fd, (json.dumps({'type': 'rotated', 'previous': st.st_ino}) + '\n').encode('utf-8'))
+        finally:
+            os.close(fd)
+
+    def _continues(self, lines, previous):
+        if not lines:
+            return False
+        try:
+            header = json.loads(lines[0])
+        except ValueError:
+            return False
+        return header.get('type') == 'rotated' and header.get('previous') == previous
+
+    def _open(self, seek_end):
+        self._file = open(self.path, 'rb')
+        self._inode = os.fstat(self._file.fileno()).st_ino
+        self._pending = b''
+        if seek_end:
+            self._file.seek(0, os.SEEK_END)
+
+    def _close(self):
+        if self._file is not None:
+            self._file.close()
+        self._file, self._inode, self._pending = None, None, b''
+
+    def _read(self):
+        # Complete lines only; a partially written last line waits for the next poll
+        data = self._pending + self._file.read()
+        end = data.rfind(b'\n') + 1
+        self._pending = data[end:]
+        return data[:end].decode('utf-8').splitlines()
@@ -0,0 +1,61 @@
+import csv
+import os
+
+# Rows pulled from the server per round trip while streaming the source tables
+STREAM_BATCH_SIZE = int(os.environ.get('FYP_INDEX_STREAM_BATCH', 1000))
+
+class MySQLSource:
+    """Source tables streamed from MySQL in batches; connect() returns (conn, dictionary cursor)"""
+    def __init__(self, connect, batch_size=STREAM_BATCH_SIZE):
+        self.connect = connect
+        self.batch_size = batch_size
+
+    def rows(self, table, columns, supervisor_ids=None):
+        """Yield {SupervisorID, *columns} rows of a table, optionally only for some supervisors"""
+        query = "SELECT SupervisorID, {} FROM {}".format(', '.join(columns), table)
+        params = ()
+        if supervisor_ids is not None:
+            supervisor_ids = sorted(supervisor_ids)
+            query += " WHERE SupervisorID IN ({})".format(', '.join(['%s'] * len(supervisor_ids)))
+            params = tuple(supervisor_ids)
+
+        conn, cursor = self.connect()
+        try:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(self.batch_size)
+                if not rows:
+                    return
+                yield from rows
+        finally:
+            cursor.close()
+            conn.close()
+
+class MemorySource:
+    """Source tables held in memory as lists of row dicts; for benchmarks, tests and CSV exports"""
+    def __init__(self, tables):
+        self.tables = tables
+
+    @classmethod
+    def from_expertise_csv(cls, path):
+        """Supervisors and their expertise from an export like expertise.csv (';'-separated)
+
+        The export has no supervisor table, so names and emails are made up from the ids.
+        """
+        expertise = []
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f, delimiter=';'):
+                expertise.append({'SupervisorID': int(row['SupervisorID']), 'Expertise': row['Expertise']})
+
+        supervisor_ids = sorted({row['SupervisorID'] for row in expertise})
+        supervisors = [
+            {'SupervisorID': supervisor_id, 'SvName': f"Supervisor {supervisor_id}",
+             'SvEmail': f"supervisor{supervisor_id}@example.com"}
+            for supervisor_id in supervisor_ids
+        ]
+        return cls({'supervisor': supervisors, 'expertise': expertise})
+
+    def rows(self, table, columns, supervisor_ids=None):
+        for row in self.tables.get(table, ()):
+            if supervisor_ids is None or row['SupervisorID'] in supervisor_ids:
+                yield {'SupervisorID': row['SupervisorID'], **{column: row.get(column) for column in columns}}
@@ -0,0 +1,208 @@
+import collections
+import os
+import threading
+import time
+import mysql.connector
+from mysql.connector.errors import PoolError
+
+# Database configuration
+db_config = {
+    'host': 'localhost',
+    'user': 'root',
+    'password': '',
+    'database': 'project_supervisor_rec'
+}
+
+# Connection pool tuning
+POOL_SIZE = int(os.environ.get('FYP_DB_POOL_SIZE', 10))
+POOL_TIMEOUT = float(os.environ.get('FYP_DB_POOL_TIMEOUT', 5.0))        # seconds to wait for a free connection
+POOL_RECYCLE = float(os.environ.get('FYP_DB_POOL_RECYCLE', 1800.0))     # maximum connection age in seconds
+POOL_PING_AFTER = float(os.environ.get('FYP_DB_POOL_PING_AFTER', 10.0))  # idle seconds before checkout pings
+
+# Called with the duration of every statement when set (metrics.py installs one)
+query_observer = None
+
+def set_query_observer(observer):
+    global query_observer
+    query_observer = observer
+
+class ObservedCursor:
+    """Cursor proxy that reports how long each execute() took"""
+    def __init__(self, cursor, observer):
+        self._cursor = cursor
+        self._observer = observer
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def execute(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(*args, **kwargs)
+        finally:
+            self._observer(time.perf_counter() - started)
+
+    def executemany(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._cursor.executemany(*args, **kwargs)
+        finally:
+            self._observer(time.perf_counter() - started)
+
+class PooledConnection:
+    """Connection proxy whose close() hands the connection back to the pool"""
+    def __init__(self, pool, conn, created_at):
+        self._pool = pool
+        self._conn = conn
+        self._created_at = created_at
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def cursor(self, *args, **kwargs):
+        cursor = self._conn.cursor(*args, **kwargs)
+        # No proxy at all unless someone is listening
+        if query_observer is None:
+            return cursor
+        return ObservedCursor(cursor, query_observer)
+
+    def close(self):
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool._release(conn, self._created_at)
+
+class ConnectionPool:
+    """Bounded pool of MySQL connections with checkout timeout, health check and recycling"""
+    def __init__(self, config, size=POOL_SIZE, timeout=POOL_TIMEOUT, recycle=POOL_RECYCLE,
+                 ping_after=POOL_PING_AFTER):
+        self.config = config
+        self.size = size
+        self.timeout = timeout
+        self.recycle = recycle
+        self.ping_after = ping_after
+
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        # Idle connections as (connection, created_at, released_at); reused last-in first-out
+        self._idle = collections.deque()
+        self._in_use = 0
+        self._counters = {
+            'checkouts': 0,
+            'waits': 0,
+            'wait_seconds': 0.0,
+            'timeouts': 0,
+            'created': 0,
+            'recycled': 0,
+            'failed_health_checks': 0
+        }
+
+    def get_connection(self):
+        """Borrow a connection; closing it returns it to the pool"""
+        started = time.monotonic()
+        if not self._slots.acquire(blocking=False):
+            acquired = self._slots.acquire(timeout=self.timeout)
+            with self._lock:
+                self._counters['waits'] += 1
+                self._counters['wait_seconds'] += time.monotonic() - started
+                if not acquired:
+                    self._counters['timeouts'] += 1
+            if not acquired:
+                raise PoolError(msg=f"No database connection available within {self.timeout}s")
+
+        try:
+            conn = self._checkout()
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._in_use += 1
+            self._counters['checkouts'] += 1
+        return conn
+
+    def _checkout(self):
+        while True:
+            with self._lock:
+                idle = self._idle.pop() if self._idle else None
+
+            if idle is None:
+                conn = mysql.connector.connect(**self.config)
+                with self._lock:
+                    self._counters['created'] += 1
+                return PooledConnection(self, conn, time.monotonic())
+
+            conn, created_at, released_at = idle
+            now = time.monotonic()
+            if now - created_at > self.recycle:
+                self._discard(conn, 'recycled')
+                continue
+
+            # Only connections that sat idle for a while are worth a round trip to check
+            if now - released_at > self.ping_after:
+                try:
+                    conn.ping(reconnect=False)
+                except mysql.connector.Error:
+                    self._discard(conn, 'failed_health_checks')
+                    continue
+
+            return PooledConnection(self, conn, created_at)
+
+    def _release(self, conn, created_at):
+        try:
+            # Never hand the next borrower unread rows or an open transaction
+            if conn.unread_result:
+                conn.consume_results()
+            if conn.in_transaction:
+                conn.rollback()
+            reusable = True
+        except mysql.connector.Error:
+            reusable = False
+
+        with self._lock:
+            self._in_use -= 1
+            if reusable:
+                self._idle.append((conn, created_at, time.monotonic()))
+        if not reusable:
+            self._discard(conn, 'failed_health_checks')
+        self._slots.release()
+
+    def _discard(self, conn, reason):
+        with self._lock:
+            self._counters[reason] += 1
+        try:
+            conn.close()
+        except mysql.connector.Error:
+            pass
+
+    def stats(self):
+        """Pool utilization and lifetime counters for monitoring"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats.update({
+                'size': self.size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'utilization': self._in_use / self.size if self.size else 0.0
+            })
+        return stats
+
+# One pool per process; a forked worker must not reuse its parent's sockets
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    global _pool, _pool_pid
+    if _pool is None or _pool_pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool_pid != os.getpid():
+                _pool = ConnectionPool(db_config)
+                _pool_pid = os.getpid()
+    return _pool
+
+def get_connection():
+    """Borrow a pooled connection"""
+    return get_pool().get_connection()
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+import numpy as np
+import scipy.sparse as sp
+
+# Bump whenever the text analysis or the snapshot layout changes so old snapshots count as stale
+FORMAT_VERSION = 5
+
+# Arrays stored as separate .npy files so they can be memory-mapped on load (plus one idf-<field> per field)
+ARRAY_NAMES = ('data', 'indices', 'indptr', 'neighbours', 'neighbour_scores')
+
+# Supervisor columns persisted alongside the matrix
+METADATA_COLUMNS = ('SupervisorID', 'SvName', 'SvEmail', 'Expertise', 'expertise_phrases', 'key_terms')
+
+class ContentHasher:
+    """Order-independent hash of the source rows, built up while they are streamed"""
+    def __init__(self, *salt):
+        self._salt = '\x1f'.join(str(value) for value in salt)
+        self._count = 0
+        # Sum of the row digests: the same multiset of rows gives the same total in any order
+        self._total = 0
+
+    def add(self, *values):
+        digest = hashlib.sha256('\x1f'.join(str(value) for value in values).encode('utf-8')).digest()
+        self._total = (self._total + int.from_bytes(digest, 'big')) % (1 << 256)
+        self._count += 1
+
+    def hexdigest(self):
+        return hashlib.sha256(f"format:{FORMAT_VERSION}\x1e{self._salt}\x1e{self._count}\x1e{self._total}".encode()).hexdigest()
+
+def save_snapshot(path, fields, tfidf_matrix, supervisor_data, source_hash, key_terms_top_n,
+                  neighbours, neighbour_scores, lsa_components=None):
+    """Write a snapshot directory and atomically point path/CURRENT at it
+
+    fields lists every index field in column order as dicts with name, weight, vocabulary and idf.
+    lsa_components, the fitted SVD basis of an LSA-scored index, is optional.
+    """
+    os.makedirs(path, exist_ok=True)
+    name = f"snapshot-{source_hash[:12]}-{int(time.time() * 1000)}"
+    tmp_dir = os.path.join(path, f".{name}.tmp")
+
+    tfidf_matrix = sp.csr_matrix(tfidf_matrix)
+    tfidf_matrix.sort_indices()
+
+    os.makedirs(tmp_dir)
+    try:
+        arrays = {
+            'data': tfidf_matrix.data,
+            'indices': tfidf_matrix.indices,
+            'indptr': tfidf_matrix.indptr,
+            'neighbours': neighbours,
+            'neighbour_scores': neighbour_scores
+        }
+        for field in fields:
+            arrays[f"idf-{field['name']}"] = np.asarray(field['idf'], dtype=np.float64)
+        if lsa_components is not None:
+            arrays['lsa_components'] = lsa_components
+        for array_name, array in arrays.items():
+            np.save(os.path.join(tmp_dir, f"{array_name}.npy"), np.ascontiguousarray(array))
+
+        meta = {
+            'format_version': FORMAT_VERSION,
+            'content_hash': source_hash,
+            'built_at': time.time(),
+            'shape': list(tfidf_matrix.shape),
+            'key_terms_top_n': key_terms_top_n,
+            'lsa_components': lsa_components is not None,
+            'fields': [
+                {
+                    'name': field['name'],
+                    'weight': field['weight'],
+                    'vocabulary': [str(term) for term in field['vocabulary']]
+                }
+                for field in fields
+            ],
+            'supervisors': {
+                column: [_to_json_value(value) for value in supervisor_data[column]]
+                for column in METADATA_COLUMNS
+            }
+        }
+        with open(os.path.join(tmp_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+        os.rename(tmp_dir, os.path.join(path, name))
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    # Swap the pointer last so readers only ever see a complete snapshot
+    pointer_tmp = os.path.join(path, f".CURRENT.{os.getpid()}.tmp")
+    with open(pointer_tmp, 'w', encoding='utf-8') as f:
+        f.write(name)
+    os.replace(pointer_tmp, os.path.join(path, 'CURRENT'))
+
+    _remove_old_snapshots(path, keep=name)
+    return os.path.join(path, name)
+
+def load_snapshot(path):
+    """Load the current snapshot with memory-mapped arrays, or None if there is none usable"""
+    try:
+        with open(os.path.join(path, 'CURRENT'), encoding='utf-8') as f:
+            snapshot_dir = os.path.join(path, f.read().strip())
+
+        with open(os.path.join(snapshot_dir, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if meta.get('format_version') != FORMAT_VERSION:
+        return None
+
+    array_names = list(ARRAY_NAMES) + [f"idf-{field['name']}" for field in meta['fields']]
+    if meta.get('lsa_components'):
+        array_names.append('lsa_components')
+    try:
+        arrays = {
+            array_name: np.load(os.path.join(snapshot_dir, f"{array_name}.npy"), mmap_mode='r')
+            for array_name in array_names
+        }
+    except (OSError, ValueError):
+        # Replaced by another process between reading CURRENT and opening the arrays
+        return None
+
+    tfidf_matrix = sp.csr_matrix(
+        (arrays['data'], arrays['indices'], arrays['indptr']),
+        shape=tuple(meta['shape']),
+        copy=False
+    )
+
+    return {
+        'content_hash': meta['content_hash'],
+        'built_at': meta['built_at'],
+        'fields': [
+            dict(field, idf=arrays[f"idf-{field['name']}"])
+            for field in meta['fields']
+        ],
+        'neighbours': arrays['neighbours'],
+        'neighbour_scores': arrays['neighbour_scores'],
+        'tfidf_matrix': tfidf_matrix,
+        'supervisors': meta['supervisors'],
+        'key_terms_top_n': meta.get('key_terms_top_n'),
+        'lsa_components': arrays.get('lsa_components')
+    }
+
+def _remove_old_snapshots(path, keep):
+    # Unlinking is safe for processes that still have the old files mapped
+    for entry in os.listdir(path):
+        if entry.startswith('snapshot-') and entry != keep:
+            shutil.rmtree(os.path.join(path, entry), ignore_errors=True)
+
+def _to_json_value(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
@@ -0,0 +1,248 @@
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from flask import Response, request
+
+# Request instrumentation; the /metrics endpoint is only registered when enabled
+METRICS_ENABLED = os.environ.get('FYP_METRICS', '1') == '1'
+# Optional bearer token required to scrape /metrics
+METRICS_TOKEN = os.environ.get('FYP_METRICS_TOKEN')
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    """Monotonic counter per label combination"""
+    type = 'counter'
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        with self._lock:
+            values = dict(self._values)
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+                for key, value in sorted(values.items())]
+
+class Histogram:
+    """Cumulative bucket counts, sum and count per label combination"""
+    type = 'histogram'
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (last one is +Inf), sum, count]
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(label_values)
+            if series is None:
+                series = self._values[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][position] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, *label_values):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *label_values)
+
+    def render(self):
+        with self._lock:
+            values = {key: (list(series[0]), series[1], series[2]) for key, series in self._values.items()}
+        lines = []
+        for key, (counts, total, count) in sorted(values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labels, key, [('le', _format_value(bound))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+class Registry:
+    """Metrics owned by this process plus collectors that read other components' stats at scrape time"""
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def counter(self, name, help, labels=()):
+        metric = Counter(name, help, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        metric = Histogram(name, help, labels, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector):
+        """collector() returns (name, type, help, [(labels dict, value)]) families"""
+        self._collectors.append(collector)
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            try:
+                families = collector()
+            except Exception as e:
+                # A broken component must not take the whole scrape down
+                print(f"Metrics collector error: {e}")
+                continue
+            for name, metric_type, help, samples in families:
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(labels.keys(), labels.values())} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+registry = Registry()
+
+REQUESTS = registry.counter('fyp_http_requests_total', 'HTTP responses by route, method and status',
+                            ('endpoint', 'method', 'status'))
+REQUEST_SECONDS = registry.histogram('fyp_http_request_duration_seconds', 'Request handling time by route',
+                                     ('endpoint', 'method'))
+DB_QUERIES = registry.counter('fyp_db_queries_total', 'MySQL statements by the route that ran them',
+                              ('endpoint',))
+DB_QUERY_SECONDS = registry.histogram('fyp_db_query_duration_seconds', 'MySQL statement time by route',
+                                      ('endpoint',), QUERY_BUCKETS)
+DB_QUERIES_PER_REQUEST = registry.histogram('fyp_db_queries_per_request', 'MySQL statements run by one request',
+                                            ('endpoint',), COUNT_BUCKETS)
+SCORING_SECONDS = registry.histogram('fyp_recommender_scoring_seconds', 'Recommender search time by operation',
+                                     ('operation',), QUERY_BUCKETS + (2.5, 5.0))
+
+class _RequestState:
+    __slots__ = ('endpoint', 'started', 'queries', 'lock')
+
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+        self.started = time.perf_counter()
+        self.queries = 0
+        # Worker threads running in a copy of the request's context share this state
+        self.lock = threading.Lock()
+
+# State of the request being handled by this thread; unset in background threads that were not
+# started in a copy of a request's context
+_current = ContextVar('fyp_metrics_request', default=None)
+
+def observe_query(seconds):
+    """db.py query observer: attribute a statement to the current request's route"""
+    state = _current.get()
+    endpoint = state.endpoint if state is not None else 'background'
+    if state is not None:
+        with state.lock:
+            state.queries += 1
+    DB_QUERIES.inc(endpoint)
+    DB_QUERY_SECONDS.observe(seconds, endpoint)
+
+def _route():
+    # The URL rule, not the path, so ids do not explode the label space
+    rule = request.url_rule
+    return rule.rule if rule is not None else 'unmatched'
+
+def _before_request():
+    _current.set(_RequestState(_route()))
+
+def _after_request(response):
+    state = _current.get()
+    if state is not None:
+        method = request.method
+        REQUESTS.inc(state.endpoint, method, str(response.status_code))
+        REQUEST_SECONDS.observe(time.perf_counter() - state.started, state.endpoint, method)
+        DB_QUERIES_PER_REQUEST.observe(state.queries, state.endpoint)
+    return response
+
+def _teardown_request(error=None):
+    _current.set(None)
+
+def metrics_endpoint():
+    if METRICS_TOKEN and request.headers.get('Authorization') != f"Bearer {METRICS_TOKEN}":
+        return Response('Unauthorized\n', status=401, mimetype='text/plain')
+    return Response(registry.render(), content_type=CONTENT_TYPE)
+
+def init_app(app):
+    """Time every request and serve /metrics; call before any other before_request hook is added"""
+    if not METRICS_ENABLED:
+        return
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    app.add_url_rule('/metrics', 'metrics', metrics_endpoint)
+
+def cache_collector(cache):
+    """Per-namespace cache counters and hit ratios, plus cache occupancy"""
+    def collect():
+        stats = cache.stats()
+        events = []
+        ratios = []
+        for namespace, counters in sorted(stats['namespaces'].items()):
+            for event, value in sorted(counters.items()):
+                events.append(({'namespace': namespace, 'event': event}, value))
+            lookups = counters.get('hits', 0) + counters.get('misses', 0)
+            if lookups:
+                ratios.append(({'namespace': namespace}, counters.get('hits', 0) / lookups))
+        families = [
+            ('fyp_cache_events_total', 'counter', 'Cache events by namespace', events),
+            ('fyp_cache_hit_ratio', 'gauge', 'Share of cache lookups that hit, by namespace', ratios),
+            ('fyp_cache_entries', 'gauge', 'Entries held by the cache', [({}, stats['entries'])])
+        ]
+        if stats.get('bytes') is not None:
+            families.append(('fyp_cache_bytes', 'gauge', 'Estimated bytes held by the cache', [({}, stats['bytes'])]))
+        return families
+    return collect
+
+def stats_collector(prefix, help, get_stats, gauges=()):
+    """Export a component's flat numeric stats() dict; keys in gauges are gauges, the rest counters"""
+    def collect():
+        families = []
+        for key, value in sorted(get_stats().items()):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            if key in gauges:
+                families.append((f"{prefix}_{key}", 'gauge', f"{help}: {key}", [({}, value)]))
+            else:
+                families.append((f"{prefix}_{key}_total", 'counter', f"{help}: {key}", [({}, value)]))
+        return families
+    return collect
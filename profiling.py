@@ -0,0 +1,156 @@
+import cProfile
+import io
+import itertools
+import json
+import os
+import pstats
+import random
+import re
+import tempfile
+import time
+from contextvars import ContextVar
+from flask import request, session
+
+# FYP_PROFILING=0 removes the hooks entirely; otherwise an admin can ask for a profile per request
+PROFILING_ENABLED = os.environ.get('FYP_PROFILING', '1') == '1'
+# Share of all requests profiled without being asked (0 = only on request)
+PROFILE_SAMPLE_RATE = float(os.environ.get('FYP_PROFILE_SAMPLE_RATE', 0.0))
+PROFILE_DIR = os.environ.get('FYP_PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'fyp_profiles'))
+
+# An admin sets this header (or the query flag) to 1 to profile one request
+PROFILE_HEADER = 'X-FYP-Profile'
+PROFILE_QUERY_FLAG = '_profile'
+
+# Functions listed in the text report
+TOP_FUNCTIONS = 40
+
+# Time reported per area: (file path fragment, function name or None for the whole file)
+PROFILE_AREAS = {
+    'text_analysis': [('AiEngine.py', 'terms'), ('AiEngine.py', 'preprocess_text'), ('AiEngine.py', 'analyze_query')],
+    'scoring': [('AiEngine.py', 'score'), ('AiEngine.py', 'score_batch'), ('AiEngine.py', 'top_k')],
+    'query_vectorizing': [('AiEngine.py', 'transform')],
+    'pandas': [(os.sep + 'pandas' + os.sep, None)],
+    'mysql': [(os.sep + 'mysql' + os.sep, None)],
+    'json': [('responses.py', None), (os.sep + 'json' + os.sep, None)]
+}
+
+_active = ContextVar('fyp_profiler', default=None)
+_UNSAFE_RE = re.compile(r'[^A-Za-z0-9_.-]+')
+# Tells apart profiles saved by this process within the same millisecond
+_sequence = itertools.count()
+
+def _requested():
+    """'admin' for a profile an admin asked for, 'sampled' for a sampled request, else None"""
+    # Cheap checks first; the session is only decoded when a flag is present
+    if request.headers.get(PROFILE_HEADER) == '1' or request.args.get(PROFILE_QUERY_FLAG) == '1':
+        if 'admin_username' in session:
+            return 'admin'
+    if PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE:
+        return 'sampled'
+    return None
+
+def _before_request():
+    reason = _requested()
+    if reason is None:
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Another profiler is already running in this process
+        return
+    _active.set((profiler, time.perf_counter(), reason))
+
+def _after_request(response):
+    active = _active.get()
+    if active is None:
+        return response
+    profiler, started, reason = active
+    profiler.disable()
+    _active.set(None)
+
+    try:
+        name = save_profile(profiler, time.perf_counter() - started, response.status_code)
+        # Only an admin who asked learns the file name; sampled requests get no header
+        if reason == 'admin':
+            response.headers[PROFILE_HEADER] = name
+    except Exception as e:
+        print(f"Profile save error: {e}")
+    return response
+
+def _teardown_request(error=None):
+    # Only reached with a live profiler when the response was never finalized
+    active = _active.get()
+    if active is not None:
+        active[0].disable()
+        _active.set(None)
+
+def area_times(stats):
+    """Inclusive seconds per PROFILE_AREAS entry, taken from the outermost matching call"""
+    times = {}
+    for area, patterns in PROFILE_AREAS.items():
+        total = 0.0
+        for (filename, _, function), (_, _, own_time, cumulative, callers) in stats.stats.items():
+            for fragment, name in patterns:
+                if fragment in filename and (name is None or function == name):
+                    # Whole-file areas add up own time; named functions count once, from the outside
+                    if name is None:
+                        total += own_time
+                    elif not any(fragment in caller[0] and caller[2] == name for caller in callers):
+                        total += cumulative
+                    break
+        times[area] = total
+    return times
+
+def save_profile(profiler, wall_seconds, status_code):
+    """Write <name>.prof (pstats/snakeviz), <name>.txt and <name>.json; returns the name"""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    endpoint = request.url_rule.rule if request.url_rule is not None else request.path
+    now = time.time()
+    name = "{}-{:03d}-{}-{}-{}".format(time.strftime('%Y%m%d-%H%M%S', time.localtime(now)), int(now * 1000) % 1000,
+                                       _UNSAFE_RE.sub('_', endpoint).strip('_') or 'root', os.getpid(), next(_sequence))
+    path = os.path.join(PROFILE_DIR, name)
+
+    profiler.dump_stats(path + '.prof')
+    stats = pstats.Stats(profiler)
+    areas = area_times(stats)
+
+    report = io.StringIO()
+    report.write(f"{request.method} {request.full_path} -> {status_code} in {wall_seconds * 1000:.1f} ms\n\n")
+    report.write("Time by area (seconds):\n")
+    for area, seconds in areas.items():
+        report.write(f"  {area:20} {seconds:.4f}\n")
+    report.write("\n")
+    stats.stream = report
+    stats.sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+    stats.sort_stats('tottime').print_stats(TOP_FUNCTIONS)
+    # Call tree of the most expensive calls
+    stats.sort_stats('cumulative').print_callees(TOP_FUNCTIONS // 4)
+    with open(path + '.txt', 'w', encoding='utf-8') as f:
+        f.write(report.getvalue())
+
+    top = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:TOP_FUNCTIONS]
+    summary = {
+        'method': request.method,
+        'path': request.full_path,
+        'endpoint': endpoint,
+        'status': status_code,
+        'wall_seconds': wall_seconds,
+        'areas': areas,
+        'top_functions': [
+            {'function': f"{filename}:{line}({function})", 'calls': calls,
+             'own_seconds': own_time, 'cumulative_seconds': cumulative}
+            for (filename, line, function), (_, calls, own_time, cumulative, _) in top
+        ]
+    }
+    with open(path + '.json', 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+    return name
+
+def init_app(app):
+    """Profile flagged or sampled requests; with FYP_PROFILING=0 nothing is installed"""
+    if not PROFILING_ENABLED:
+        return
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
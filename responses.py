@@ -0,0 +1,76 @@
+import gzip
+import hashlib
+import os
+from flask.json.provider import DefaultJSONProvider
+
+# Optional accelerators; without them we fall back to the json module and gzip only
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are not worth compressing
+COMPRESS_MIN_BYTES = int(os.environ.get('FYP_COMPRESS_MIN_BYTES', 1024))
+GZIP_LEVEL = int(os.environ.get('FYP_GZIP_LEVEL', 6))
+BROTLI_QUALITY = int(os.environ.get('FYP_BROTLI_QUALITY', 5))
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider, with orjson doing the encoding when it is installed
+
+    The output decodes to the same values as the default provider's: sorted keys, and dates,
+    decimals and UUIDs handed to the same default() hook (so datetimes still become HTTP dates).
+    Non-ASCII text is written as UTF-8 rather than \\u escapes.
+    """
+    def dumps(self, obj, **kwargs):
+        # Compact separators are what orjson writes anyway; pretty printing (debug mode) and other
+        # json.dumps arguments stay on the json module
+        if kwargs.get('separators') == (',', ':'):
+            kwargs.pop('separators')
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode('utf-8')
+
+    def response(self, *args, **kwargs):
+        """jsonify(): the body is encoded by dumps_bytes unless the output is pretty printed"""
+        if orjson is None or (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj) + b'\n', mimetype=self.mimetype)
+
+    def dumps_bytes(self, obj):
+        """UTF-8 encoded JSON without the str round trip"""
+        if orjson is None:
+            return super().dumps(obj).encode('utf-8')
+        options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=options)
+
+def make_json_entry(body):
+    """A serialized body in every encoding we serve, plus its ETag
+
+    The ETag is a hash of the bytes, so every worker derives the same one for the same data.
+    """
+    bodies = {'identity': body}
+    if len(body) >= COMPRESS_MIN_BYTES:
+        bodies['gzip'] = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+        if brotli is not None:
+            bodies['br'] = brotli.compress(body, quality=BROTLI_QUALITY)
+    return {'etag': hashlib.sha256(body).hexdigest()[:32], 'bodies': bodies}
+
+def choose_encoding(entry, accept_encodings):
+    """Smallest stored encoding the client accepts, 'identity' when it accepts none"""
+    best = 'identity'
+    for encoding, body in entry['bodies'].items():
+        if accept_encodings[encoding] > 0 and len(body) < len(entry['bodies'][best]):
+            best = encoding
+    return best
+
+def entry_etag(entry, encoding):
+    """Strong ETags must differ between encodings of the same data"""
+    return entry['etag'] if encoding == 'identity' else f"{entry['etag']}-{encoding}"
@@ -0,0 +1,20 @@
+-- Indexes behind the paginated past FYP catalogue (/api/past_fyp).
+-- Run once per database by an account with ALTER privilege, outside serving hours on a large table:
+--
+--     mysql -u root project_supervisor_rec < sql/past_fyp_indexes.sql
+--
+-- The web account needs no extra privilege. The free-text search (q) needs the FULLTEXT index;
+-- the other indexes only make their filters fast.
+
+-- Default sort order and keyset pagination: ORDER BY Year DESC, Author, ProjectID
+CREATE INDEX idx_past_fyp_year_author ON past_fyp (Year DESC, Author, ProjectID);
+
+-- Filtering one supervisor's projects in the same order
+CREATE INDEX idx_past_fyp_supervisor_year ON past_fyp (SupervisorID, Year DESC, Author, ProjectID);
+
+-- Title and author prefix filters (LIKE 'text%')
+CREATE INDEX idx_past_fyp_title ON past_fyp (Title(191));
+CREATE INDEX idx_past_fyp_author ON past_fyp (Author(191));
+
+-- Free-text search: MATCH (Title, Author) AGAINST ('+word* ...' IN BOOLEAN MODE)
+CREATE FULLTEXT INDEX ft_past_fyp_title_author ON past_fyp (Title, Author);
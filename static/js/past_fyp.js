@@ -4,19 +4,53 @@ const modalAuthor = document.getElementById('modalAuthor');
 const modalYear = document.getElementById('modalYear');
 const modalAbstract = document.getElementById('modalAbstract');
 const searchInput = document.getElementById('searchInput');
+const projectTable = document.getElementById('projectTable');
+const loadMore = document.getElementById('loadMore');
+const loadMoreButton = document.getElementById('loadMoreButton');
+const loadingIndicator = document.getElementById('loadingIndicator');
+
+// Pages come from /api/past_fyp; the cursor points just past the last row shown
+let searchText = '';
+let nextCursor = null;
+let loading = false;
+let pageRequest = null;
+let searchTimer = null;
+
+// Abstracts are fetched on demand and kept for the rest of the visit
+const abstracts = new Map();
 
 // Enhanced modal opening with animation
-function showAbstract(projectId, title, author, year, abstract) {
-    modalTitle.textContent = title;
-    modalAuthor.textContent = author;
-    modalYear.textContent = year;
-    modalAbstract.textContent = abstract;
+async function showAbstract(project) {
+    modalTitle.textContent = project.Title;
+    modalAuthor.textContent = project.Author;
+    modalYear.textContent = project.Year;
+    modalAbstract.textContent = abstracts.get(project.ProjectID) || 'Loading abstract...';
     modal.style.display = 'block';
-    
+
     // Add class for opening animation
     setTimeout(() => {
         modal.classList.add('active');
     }, 10);
+
+    if (!abstracts.has(project.ProjectID)) {
+        try {
+            const response = await fetch(`/api/past_fyp/${project.ProjectID}/abstract`);
+            if (!response.ok) {
+                throw new Error('Failed to fetch abstract');
+            }
+            const data = await response.json();
+            abstracts.set(project.ProjectID, data.Abstract || 'No abstract available.');
+        } catch (error) {
+            console.error('Error:', error);
+            modalAbstract.textContent = 'Failed to load the abstract. Please try again later.';
+            return;
+        }
+
+        // Only fill in the modal if it still shows this project
+        if (modalTitle.textContent === project.Title) {
+            modalAbstract.textContent = abstracts.get(project.ProjectID);
+        }
+    }
 }
 
 // Enhanced modal closing with animation
@@ -41,65 +75,121 @@ document.addEventListener('keydown', function(event) {
     }
 });
 
-// Real-time filtering on input rather than just Enter key
+// Search on the server once typing pauses
 searchInput.addEventListener('input', function() {
-    const searchText = searchInput.value.toLowerCase();
-    filterProjects(searchText);
+    clearTimeout(searchTimer);
+    searchTimer = setTimeout(() => {
+        startSearch(searchInput.value.trim());
+    }, 250);
 });
 
 // Keep the original Enter key functionality as well
 searchInput.addEventListener('keyup', function(event) {
     if (event.key === 'Enter') {
-        const searchText = searchInput.value.toLowerCase();
-        filterProjects(searchText);
+        clearTimeout(searchTimer);
+        startSearch(searchInput.value.trim());
     }
 });
 
-function filterProjects(searchText) {
-    const rows = document.querySelectorAll('tbody tr');
-    let resultsFound = false;
-    
-    for (let i = 0; i < rows.length; i++) {
-        const row = rows[i];
-        const title = row.cells[1].textContent.toLowerCase();
-        const author = row.cells[0].textContent.toLowerCase();
-        const year = row.cells[2].textContent.toLowerCase();
-        
-        // Enhanced search to include year as well
-        if (searchText === '' || 
-            title.includes(searchText) || 
-            author.includes(searchText) ||
-            year.includes(searchText)) {
-            row.style.display = '';
-            resultsFound = true;
-            
-            // Reset any highlight from previous searches
-            highlightMatchedText(row, searchText);
-        } else {
-            row.style.display = 'none';
-        }
+loadMoreButton.addEventListener('click', function() {
+    fetchProjects();
+});
+
+function startSearch(text) {
+    if (text === searchText && projectTable.rows.length > 0) return;
+
+    searchText = text;
+    nextCursor = null;
+    projectTable.innerHTML = '';
+    fetchProjects();
+}
+
+async function fetchProjects() {
+    // A new search replaces whatever page is still in flight
+    if (pageRequest) {
+        pageRequest.abort();
     }
-    
-    // Show or hide "no results" message
-    const noResultsElement = document.getElementById('noResults');
-    if (noResultsElement) {
-        noResultsElement.style.display = resultsFound || searchText === '' ? 'none' : 'block';
+    pageRequest = new AbortController();
+    const request = pageRequest;
+
+    const params = new URLSearchParams();
+    if (searchText) params.set('q', searchText);
+    if (nextCursor) params.set('after', nextCursor);
+
+    loading = true;
+    loadingIndicator.style.display = 'block';
+    loadMore.style.display = 'none';
+    document.getElementById('errorMessage').style.display = 'none';
+
+    try {
+        const response = await fetch(`/api/past_fyp?${params.toString()}`, { signal: request.signal });
+        if (!response.ok) {
+            throw new Error('Failed to fetch projects');
+        }
+
+        const data = await response.json();
+        appendProjects(data.projects);
+        nextCursor = data.next_cursor;
+
+        // Show or hide "no results" message
+        const noResultsElement = document.getElementById('noResults');
+        if (noResultsElement) {
+            noResultsElement.style.display = projectTable.rows.length === 0 && searchText !== '' ? 'block' : 'none';
+        }
+        loadMore.style.display = data.has_more ? 'block' : 'none';
+    } catch (error) {
+        if (error.name === 'AbortError') return;
+        console.error('Error:', error);
+        document.getElementById('errorMessage').style.display = 'block';
+    } finally {
+        if (request === pageRequest) {
+            loading = false;
+            pageRequest = null;
+            loadingIndicator.style.display = 'none';
+        }
     }
 }
 
+function appendProjects(projects) {
+    const fragment = document.createDocumentFragment();
+
+    projects.forEach(project => {
+        const row = document.createElement('tr');
+        [project.Author, project.Title, project.Year].forEach(value => {
+            const cell = document.createElement('td');
+            cell.textContent = value;
+            row.appendChild(cell);
+        });
+
+        row.addEventListener('click', function(e) {
+            addRipple(this, e);
+            showAbstract(project);
+        });
+
+        highlightMatchedText(row, searchText);
+        fragment.appendChild(row);
+    });
+
+    projectTable.appendChild(fragment);
+}
+
 // Highlight matching text in search results
 function highlightMatchedText(row, searchText) {
     if (!searchText) return;
-    
+
+    const terms = searchText.split(/\s+/).filter(term => term && !/^\d{4}$/.test(term));
+    if (terms.length === 0) return;
+
+    const regex = new RegExp(`(${terms.map(escapeRegExp).join('|')})`, 'gi');
     const cells = [row.cells[0], row.cells[1]]; // Author and title cells
-    
+
     cells.forEach(cell => {
         const originalText = cell.textContent;
-        if (!originalText.toLowerCase().includes(searchText.toLowerCase())) return;
-        
-        // Create highlighted HTML
-        const regex = new RegExp(`(${escapeRegExp(searchText)})`, 'gi');
-        const highlightedText = originalText.replace(regex, '<span class="highlight">$1</span>');
+        if (!regex.test(originalText)) return;
+        regex.lastIndex = 0;
+
+        // Create highlighted HTML from escaped text
+        const highlightedText = escapeHtml(originalText).replace(regex, '<span class="highlight">$1</span>');
         cell.innerHTML = highlightedText;
     });
 }
@@ -109,32 +199,46 @@ function escapeRegExp(string) {
     return string.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
 }
 
-// Add ripple effect to table rows
+function escapeHtml(string) {
+    const div = document.createElement('div');
+    div.textContent = string;
+    return div.innerHTML;
+}
+
+// Add ripple effect to a clicked table row
+function addRipple(row, e) {
+    const ripple = document.createElement('span');
+    ripple.classList.add('ripple');
+    row.appendChild(ripple);
+
+    const x = e.clientX - row.getBoundingClientRect().left;
+    const y = e.clientY - row.getBoundingClientRect().top;
+
+    ripple.style.left = `${x}px`;
+    ripple.style.top = `${y}px`;
+
+    setTimeout(() => {
+        ripple.remove();
+    }, 600);
+}
+
 document.addEventListener('DOMContentLoaded', function() {
-    const tableRows = document.querySelectorAll('tbody tr');
-    
-    tableRows.forEach(row => {
-        row.addEventListener('click', function(e) {
-            const ripple = document.createElement('span');
-            ripple.classList.add('ripple');
-            this.appendChild(ripple);
-            
-            const x = e.clientX - this.getBoundingClientRect().left;
-            const y = e.clientY - this.getBoundingClientRect().top;
-            
-            ripple.style.left = `${x}px`;
-            ripple.style.top = `${y}px`;
-            
-            setTimeout(() => {
-                ripple.remove();
-            }, 600);
+    fetchProjects();
+
+    // Fetch the next page as the end of the table scrolls into view
+    if ('IntersectionObserver' in window) {
+        const observer = new IntersectionObserver(entries => {
+            if (entries.some(entry => entry.isIntersecting) && nextCursor && !loading) {
+                fetchProjects();
+            }
         });
-    });
-    
+        observer.observe(loadMore);
+    }
+
     // Focus search input when page loads
     if (searchInput) {
         setTimeout(() => {
             searchInput.focus();
         }, 500);
     }
-});
\ No newline at end of file
+});
@@ -41,23 +41,19 @@ async function fetchSupervisorProfile(supervisorId) {
                 <i class="fas fa-spinner fa-spin"></i> Loading supervisor profile...
             </div>`;
             
-        // Fetch supervisor data
-        const response = await fetch(`/api/supervisor/${supervisorId}`);
+        // Details, papers and similar supervisors arrive in one aggregated response
+        const response = await fetch(`/api/supervisor/${supervisorId}/profile?min_score=0.3&top_n=4`);
         if (!response.ok) {
-            throw new Error('Failed to fetch supervisor details');
+            throw new Error('Failed to fetch supervisor profile');
         }
         
-        const supervisor = await response.json();
-        
-        // Fetch papers published by this supervisor (changed from FYP projects)
-        const papersResponse = await fetch(`/api/supervisor_papers/${supervisorId}`);
-        const papersData = await papersResponse.json();
-        
-        // Once we have the supervisor data, find similar supervisors
-        const similarSupervisors = await fetchSimilarSupervisors(supervisor.expertise_areas);
+        const profile = await response.json();
+        const supervisor = profile.supervisor;
+        const similarSupervisors = profile.similar || [];
+        const papers = profile.papers || [];
         
         // Render the profile
-        renderProfile(supervisor, similarSupervisors, papersData.projects);
+        renderProfile(supervisor, similarSupervisors, papers);
         
         // Add event listeners after rendering
         addEventListeners();
@@ -76,21 +72,6 @@ async function fetchSupervisorProfile(supervisorId) {
     }
 }
 
-async function fetchSimilarSupervisors(expertise) {
-    try {
-        const response = await fetch(`/api/search_supervisors?query=${encodeURIComponent(expertise)}&min_score=0.3&top_n=4`);
-        if (!response.ok) {
-            throw new Error('Failed to fetch similar supervisors');
-        }
-        
-        const data = await response.json();
-        return data.results || [];
-    } catch (error) {
-        console.error('Error fetching similar supervisors:', error);
-        return [];
-    }
-}
-
 function renderProfile(supervisor, similarSupervisors, papers) {
     // Generate image URL - use supervisor's name for the image file
     // Convert supervisor name to a filename by replacing spaces with underscores
@@ -0,0 +1,95 @@
+import heapq
+import os
+import re
+from bisect import bisect_left
+
+# Prefixes up to this length have their answers precomputed; longer ones bisect a narrow range
+PRECOMPUTED_PREFIX_LEN = int(os.environ.get('FYP_SUGGEST_PRECOMPUTED_LEN', 2))
+# Most suggestions kept per precomputed prefix, and so the most a request can ask for
+MAX_SUGGESTIONS = int(os.environ.get('FYP_SUGGEST_MAX', 20))
+
+_SPACE_RE = re.compile(r'\s+')
+
+def normalize_prefix(text):
+    """Lowercase and collapse whitespace, the form suggestions are keyed on"""
+    return _SPACE_RE.sub(' ', text.lower()).strip()
+
+class PrefixIndex:
+    """Immutable autocomplete over a sorted key array, ranked by document frequency
+
+    Keys are normalized texts; the matches of a prefix are the contiguous run of keys that
+    start with it, found with two bisections.
+    """
+    def __init__(self, entries):
+        # entries: normalized key -> (display text, document frequency)
+        self.keys = sorted(entries)
+        self.texts = [entries[key][0] for key in self.keys]
+        self.frequencies = [entries[key][1] for key in self.keys]
+        self._precomputed = self._precompute()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def suggest(self, prefix, limit=10):
+        """Up to limit {'text', 'df'} suggestions for a prefix, most frequent first"""
+        prefix = normalize_prefix(prefix)
+        limit = min(limit, MAX_SUGGESTIONS)
+        if not prefix or limit <= 0:
+            return []
+
+        positions = self._precomputed.get(prefix)
+        if positions is None:
+            if len(prefix) <= PRECOMPUTED_PREFIX_LEN:
+                # Every short prefix with a match is precomputed
+                return []
+            start, end = self._range(prefix)
+            positions = self._best(range(start, end), limit)
+
+        return [{'text': self.texts[i], 'df': self.frequencies[i]} for i in positions[:limit]]
+
+    def _range(self, prefix):
+        start = bisect_left(self.keys, prefix)
+        # The largest code point sorts after every continuation of the prefix
+        end = bisect_left(self.keys, prefix + '\U0010ffff', start)
+        return start, end
+
+    def _best(self, positions, limit):
+        # Most documents first, then the shorter and alphabetically earlier text
+        return heapq.nsmallest(limit, positions,
+                               key=lambda i: (-self.frequencies[i], len(self.keys[i]), self.keys[i]))
+
+    def _precompute(self):
+        prefixes = {key[:length] for key in self.keys for length in range(1, PRECOMPUTED_PREFIX_LEN + 1)}
+        precomputed = {}
+        for prefix in prefixes:
+            start, end = self._range(prefix)
+            precomputed[prefix] = self._best(range(start, end), MAX_SUGGESTIONS)
+        return precomputed
+
+def build_prefix_index(terms, term_frequencies, phrase_lists):
+    """Autocomplete over single-word vocabulary terms and the raw expertise phrases of each supervisor
+
+    A phrase's frequency is the number of supervisors listing it; when a phrase and a vocabulary
+    term normalize to the same key the phrase's spelling is shown and the larger frequency kept.
+    """
+    entries = {}
+    for term, frequency in zip(terms, term_frequencies):
+        # Vocabulary bigrams may straddle two phrases; multi-word suggestions come from the phrases
+        if ' ' not in term:
+            entries[str(term)] = (str(term), int(frequency))
+
+    phrase_frequencies = {}
+    spellings = {}
+    for phrases in phrase_lists:
+        for key in {normalize_prefix(phrase) for phrase in phrases if isinstance(phrase, str)}:
+            if key:
+                phrase_frequencies[key] = phrase_frequencies.get(key, 0) + 1
+        for phrase in phrases:
+            if isinstance(phrase, str):
+                spellings.setdefault(normalize_prefix(phrase), phrase.strip())
+
+    for key, frequency in phrase_frequencies.items():
+        term_frequency = entries.get(key, (None, 0))[1]
+        entries[key] = (spellings[key], max(frequency, term_frequency))
+
+    return PrefixIndex(entries)
@@ -0,0 +1,179 @@
+import atexit
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+import mysql.connector
+from db import get_connection
+
+# Background writer tuning
+VIEW_QUEUE_SIZE = int(os.environ.get('FYP_VIEW_QUEUE_SIZE', 10000))          # events held before new ones are dropped
+VIEW_BATCH_SIZE = int(os.environ.get('FYP_VIEW_BATCH_SIZE', 500))            # distinct pairs that trigger a flush
+VIEW_FLUSH_INTERVAL = float(os.environ.get('FYP_VIEW_FLUSH_INTERVAL', 2.0))  # seconds between flushes
+
+UPSERT_SQL = """
+    INSERT INTO supervisor_views (StudentID, SupervisorID, view_count, last_viewed)
+    VALUES {}
+    ON DUPLICATE KEY UPDATE
+        view_count = view_count + VALUES(view_count),
+        last_viewed = GREATEST(last_viewed, VALUES(last_viewed))
+"""
+
+class ViewLogger:
+    """Queue supervisor views and write them in aggregated multi-row upserts on a background thread"""
+    def __init__(self, queue_size=VIEW_QUEUE_SIZE, batch_size=VIEW_BATCH_SIZE, flush_interval=VIEW_FLUSH_INTERVAL):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        # (StudentID, SupervisorID) -> [view_count, last_viewed], waiting for the next flush
+        self._pending = {}
+        self._thread = None
+        self._counters = {
+            'queued': 0,
+            'dropped': 0,
+            'flushed': 0,
+            'batches': 0,
+            'failed_batches': 0
+        }
+
+    def record(self, student_id, supervisor_id):
+        """Enqueue one view without touching the database; never blocks the request"""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((student_id, supervisor_id, datetime.now()))
+        except queue.Full:
+            with self._lock:
+                self._counters['dropped'] += 1
+            return False
+        with self._lock:
+            self._counters['queued'] += 1
+        return True
+
+    def flush(self):
+        """Write everything queued so far; used by the writer thread and at shutdown"""
+        self._drain()
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        rows = [(student_id, supervisor_id, count, last_viewed)
+                for (student_id, supervisor_id), (count, last_viewed) in pending.items()]
+        flushed = 0
+        for start in range(0, len(rows), self.batch_size):
+            chunk = rows[start:start + self.batch_size]
+            try:
+                flushed += self._write(chunk)
+            except mysql.connector.Error as err:
+                print(f"Database error in view log flush: {err}")
+                self._requeue(rows[start:])
+                break
+
+        with self._lock:
+            self._counters['flushed'] += flushed
+        return flushed
+
+    def stop(self):
+        """Stop the writer thread and flush what is left"""
+        self._stopping.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats['pending'] = self._queue.qsize() + sum(count for count, _ in self._pending.values())
+        return stats
+
+    def _ensure_started(self):
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(target=self._run, name='view-log-writer', daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        last_flush = time.monotonic()
+        while not self._stopping.is_set():
+            timeout = max(0.0, last_flush + self.flush_interval - time.monotonic())
+            try:
+                student_id, supervisor_id, viewed_at = self._queue.get(timeout=timeout)
+                with self._lock:
+                    self._merge((student_id, supervisor_id), 1, viewed_at)
+                    batch_full = len(self._pending) >= self.batch_size
+            except queue.Empty:
+                batch_full = False
+
+            if batch_full or time.monotonic() - last_flush >= self.flush_interval:
+                self.flush()
+                last_flush = time.monotonic()
+
+    def _drain(self):
+        while True:
+            try:
+                student_id, supervisor_id, viewed_at = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            with self._lock:
+                self._merge((student_id, supervisor_id), 1, viewed_at)
+
+    def _merge(self, pair, count, last_viewed):
+        # Caller holds self._lock
+        entry = self._pending.get(pair)
+        if entry is None:
+            self._pending[pair] = [count, last_viewed]
+        else:
+            entry[0] += count
+            entry[1] = max(entry[1], last_viewed)
+
+    def _requeue(self, rows):
+        # Keep unwritten views for the next attempt unless that would outgrow the queue
+        with self._lock:
+            self._counters['failed_batches'] += 1
+            if len(self._pending) + len(rows) <= self._queue.maxsize:
+                for student_id, supervisor_id, count, last_viewed in rows:
+                    self._merge((student_id, supervisor_id), count, last_viewed)
+            else:
+                self._counters['dropped'] += sum(row[2] for row in rows)
+
+    def _write(self, rows):
+        """Upsert one batch in a single statement and commit it; returns the views written"""
+        conn = get_connection()
+        cursor = conn.cursor()
+        try:
+            params = [value for row in rows for value in row]
+            try:
+                cursor.execute(UPSERT_SQL.format(', '.join(['(%s, %s, %s, %s)'] * len(rows))), params)
+                written = sum(row[2] for row in rows)
+            except mysql.connector.IntegrityError:
+                # A supervisor or student deleted since the view; write the rest one by one
+                conn.rollback()
+                written = self._write_rows(cursor, rows)
+            conn.commit()
+        finally:
+            cursor.close()
+            conn.close()
+
+        with self._lock:
+            self._counters['batches'] += 1
+        return written
+
+    def _write_rows(self, cursor, rows):
+        written = 0
+        for row in rows:
+            try:
+                cursor.execute(UPSERT_SQL.format('(%s, %s, %s, %s)'), row)
+                written += row[2]
+            except mysql.connector.IntegrityError as err:
+                print(f"Skipping view of a deleted row: {err}")
+                with self._lock:
+                    self._counters['dropped'] += row[2]
+        return written
+
+# One writer per process; started on the first view so forked workers get their own thread
+view_logger = ViewLogger()
+atexit.register(view_logger.stop)